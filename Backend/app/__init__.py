@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.log_config import LOGGING_CONFIG
 import logging.config
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,8 +16,16 @@ logger = logging.getLogger(__name__)  # get a logger instance
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Propensity Score Analysis API")
+    from app.helpers.mongodb import mongodb
+    try:
+        await mongodb.ensure_indexes()
+    except Exception as e:
+        logger.warning("Could not ensure MongoDB indexes: %s", e)
     yield
     # Shutdown
+    from app.workflows.Excel_Interview_workflow import llm_http_client
+    await llm_http_client.aclose()
+    mongodb.disconnect()
     logger.info("Shutting down Propensity Score Analysis API")
 
 # Create FastAPI app with OpenAPI documentation configuration and lifespan
@@ -50,7 +59,8 @@ app = FastAPI(
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan  # Add the lifespan manager
+    lifespan=lifespan,  # Add the lifespan manager
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
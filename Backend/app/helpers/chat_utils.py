@@ -22,12 +22,12 @@ def filter_human_messages(conversation_history: List[Dict[str, Any]]) -> List[st
         # Limit to the last 6 messages
         last_six_contents = human_message_contents[-6:] if len(human_message_contents) > 6 else human_message_contents
         
-        logger.debug(f"Filtered human message contents (last 6): {last_six_contents}")
+        logger.debug("Filtered human message contents (last 6): %s", last_six_contents)
         # print("last_six_messages: ", last_six_contents)
         return last_six_contents
     
     except Exception as e:
-        logger.error(f"Error filtering human messages: {e}")
+        logger.error("Error filtering human messages: %s", e)
         # Return empty list in case of error
         return []
     
@@ -113,10 +113,10 @@ async def condense_human_messages_to_query(messages: List[str], llm: Any) -> str
         response = await llm.acomplete(prompt)
         condensed_query = response.text.strip()
         
-        logger.debug(f"Condensed query: {condensed_query}")
+        logger.debug("Condensed query: %s", condensed_query)
         return condensed_query
     except Exception as e:
-        logger.error(f"Error condensing messages to query: {e}")
+        logger.error("Error condensing messages to query: %s", e)
         # Return the latest message in case of error
         return messages[-1] if messages else ""
 
@@ -151,7 +151,7 @@ async def get_vector_search_query(conversation_history: List[Dict[str, Any]], cu
             logger.warning("No human messages found in conversation history")
             return ""
     except Exception as e:
-        logger.error(f"Error generating vector search query: {e}")
+        logger.error("Error generating vector search query: %s", e)
         # Return current message as fallback
         return current_message
     
@@ -185,5 +185,5 @@ def log_conversation(conversation_id: str, user_message: str, bot_response: str)
         user_message: The user's message
         bot_response: The bot's response
     """
-    logger.info(f"Conversation {conversation_id}: User: {user_message}")
-    logger.info(f"Conversation {conversation_id}: Bot: {bot_response}")
+    logger.debug("Conversation %s: User: %s", conversation_id, user_message)
+    logger.debug("Conversation %s: Bot: %s", conversation_id, bot_response)
@@ -32,7 +32,7 @@ class EmbeddingsProcessor:
         try:
             # Sanitize index name
             sanitized_name = self._sanitize_index_name(index_name)
-            logger.info(f"Using index name: {sanitized_name}")
+            logger.info("Using index name: %s", sanitized_name)
             
             # Check if index exists
             existing_indexes = self.pc.list_indexes()
@@ -47,10 +47,10 @@ class EmbeddingsProcessor:
                         region="us-east-1"  # Changed to us-east-1 for free plan
                     )
                 )
-                logger.info(f"Created new Pinecone index: {sanitized_name}")
+                logger.info("Created new Pinecone index: %s", sanitized_name)
             return self.pc.Index(sanitized_name)
         except Exception as e:
-            logger.error(f"Error creating Pinecone index: {e}")
+            logger.error("Error creating Pinecone index: %s", e)
             raise
 
     def _process_excel_data(self, file_path: str) -> List[Dict[str, Any]]:
@@ -76,7 +76,7 @@ class EmbeddingsProcessor:
                 
             return documents
         except Exception as e:
-            logger.error(f"Error processing Excel file: {e}")
+            logger.error("Error processing Excel file: %s", e)
             raise
 
     def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -92,7 +92,7 @@ class EmbeddingsProcessor:
                 embeddings.append(embedding)
             return embeddings
         except Exception as e:
-            logger.error(f"Error creating embeddings: {e}")
+            logger.error("Error creating embeddings: %s", e)
             raise
 
     def _prepare_vectors(self, documents: List[Dict[str, Any]], embeddings: List[List[float]]) -> List[Dict[str, Any]]:
@@ -114,7 +114,7 @@ class EmbeddingsProcessor:
         """Main function to process Excel data and upload to Pinecone"""
         try:
             # Process Excel data
-            logger.info(f"Processing Excel file: {excel_file_path}")
+            logger.info("Processing Excel file: %s", excel_file_path)
             documents = self._process_excel_data(excel_file_path)
             
             # Extract text content for embeddings
@@ -131,7 +131,7 @@ class EmbeddingsProcessor:
             index = self._create_pinecone_index(index_name)
             
             # Upload vectors to Pinecone
-            logger.info(f"Uploading {len(vectors)} vectors to Pinecone...")
+            logger.info("Uploading %d vectors to Pinecone...", len(vectors))
             index.upsert(vectors=vectors)
             
             logger.info("Data upload completed successfully")
@@ -142,7 +142,7 @@ class EmbeddingsProcessor:
             }
             
         except Exception as e:
-            logger.error(f"Error in load_and_upload_data: {e}")
+            logger.error("Error in load_and_upload_data: %s", e)
             raise
 
 # Example usage
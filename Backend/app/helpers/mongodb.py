@@ -1,132 +1,247 @@
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 import os
+import certifi
 import logging
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from bson.objectid import ObjectId
-from urllib.parse import quote_plus
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from urllib.parse import quote_plus, unquote, urlsplit, urlunsplit
 
 # Load environment variables from .env file
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Decode documents lazily on read paths that only touch a field or two
+RAW_BSON_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def tls_options() -> Dict[str, Any]:
+    """
+    TLS keyword arguments for a MongoDB client.
+    
+    Server certificates are verified against certifi's CA bundle. Setups with
+    self-signed certificates opt out with
+    MONGODB_TLS_ALLOW_INVALID_CERTIFICATES=true.
+    """
+    if os.getenv("MONGODB_TLS_ALLOW_INVALID_CERTIFICATES", "false").lower() == "true":
+        return {"tlsAllowInvalidCertificates": True}
+    return {"tlsCAFile": certifi.where()}
+
 class MongoDB:
     _instance = None
-    _client: Optional[MongoClient] = None
+    _initialized = False
+    _lock = threading.Lock()
+    # One client per process: a client must not be shared across fork(),
+    # so pre-fork workers each lazily build their own on first use
+    _clients: Dict[int, AsyncIOMotorClient] = {}
+    _collections: Dict[Tuple[int, str, bool], AsyncIOMotorCollection] = {}
+    _mongodb_uri: Optional[str] = None
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(MongoDB, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(MongoDB, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        if not self._client:
+        # __init__ runs on every MongoDB() call; only configure once
+        if type(self)._initialized:
+            return
+        with type(self)._lock:
+            if type(self)._initialized:
+                return
             mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
             
             # Handle URL encoding for username and password if they exist in the URI
-            if "@" in mongodb_uri and "mongodb://" in mongodb_uri:
-                # Parse the URI to extract and encode username/password
-                try:
-                    # Split the URI to get the protocol and the rest
-                    protocol_part = mongodb_uri.split("://", 1)
-                    if len(protocol_part) == 2:
-                        protocol = protocol_part[0] + "://"
-                        rest = protocol_part[1]
-                        
-                        # Check if there are credentials
-                        if "@" in rest:
-                            credentials_part = rest.split("@", 1)
-                            if len(credentials_part) == 2:
-                                credentials = credentials_part[0]
-                                host_part = credentials_part[1]
-                                
-                                # Split credentials into username and password
-                                if ":" in credentials:
-                                    username, password = credentials.split(":", 1)
-                                    # URL encode username and password
-                                    encoded_username = quote_plus(username)
-                                    encoded_password = quote_plus(password)
-                                    # Reconstruct the URI
-                                    mongodb_uri = f"{protocol}{encoded_username}:{encoded_password}@{host_part}"
-                except Exception as e:
-                    logger.warning(f"Failed to encode MongoDB URI credentials: {e}")
+            try:
+                mongodb_uri = self._encode_uri_credentials(mongodb_uri)
+            except Exception as e:
+                logger.warning("Failed to encode MongoDB URI credentials: %s", e)
             
-            self._client = MongoClient(mongodb_uri, tlsAllowInvalidCertificates=True)
-            db_name = os.getenv("MONGODB_DB_NAME", "propensity_score_db")
-            self.db = self._client.get_database(db_name)
-            logger.info("MongoDB connection initialized")
+            self._mongodb_uri = mongodb_uri
+            self._db_name = os.getenv("MONGODB_DB_NAME", "propensity_score_db")
+            # Pool sizes are per worker process
+            self._max_pool_size = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+            self._min_pool_size = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+            # Lifetime of cached Excel interview workflow results (default 7 days)
+            self._workflow_cache_ttl = int(os.getenv("WORKFLOW_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+            self._tls_options = tls_options()
+            type(self)._initialized = True
+            logger.info("MongoDB configuration initialized")
+    
+    @staticmethod
+    def _encode_uri_credentials(mongodb_uri: str) -> str:
+        """URL encode the username and password of a mongodb:// or mongodb+srv:// URI"""
+        parts = urlsplit(mongodb_uri)
+        if parts.username is None:
+            return mongodb_uri
+        
+        # Keep the host list verbatim (it may hold several comma-separated hosts)
+        hosts = parts.netloc.rpartition("@")[2]
+        credentials = quote_plus(unquote(parts.username))
+        if parts.password is not None:
+            credentials += ":" + quote_plus(unquote(parts.password))
+        return urlunsplit(parts._replace(netloc=f"{credentials}@{hosts}"))
     
-    def get_collection(self, collection_name: str):
-        """Get a MongoDB collection"""
-        return self.db[collection_name]
+    @property
+    def client(self) -> AsyncIOMotorClient:
+        """Get the async Motor client owned by the current process, creating it if needed"""
+        pid = os.getpid()
+        client = self._clients.get(pid)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(pid)
+            if client is None:
+                client = AsyncIOMotorClient(
+                    self._mongodb_uri,
+                    **self._tls_options,
+                    maxPoolSize=self._max_pool_size,
+                    minPoolSize=self._min_pool_size,
+                    serverSelectionTimeoutMS=3000,
+                    connectTimeoutMS=5000,
+                    socketTimeoutMS=10000,
+                    appname="excel-interview",
+                    # zlib is the fallback for servers without zstd support
+                    compressors="zstd,zlib"
+                )
+                self._clients[pid] = client
+                logger.info("MongoDB client created for process %s", pid)
+        return client
+    
+    @property
+    def db(self):
+        """Get the configured database on the current process's client"""
+        return self.client.get_database(self._db_name)
+    
+    def get_collection(self, collection_name: str, *, raw_bson: bool = False) -> AsyncIOMotorCollection:
+        """
+        Get a MongoDB collection, memoized per process.
+        
+        With raw_bson=True the collection decodes documents as RawBSONDocument.
+        """
+        key = (os.getpid(), collection_name, raw_bson)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = self.db[collection_name]
+            if raw_bson:
+                collection = collection.with_options(codec_options=RAW_BSON_CODEC_OPTIONS)
+            self._collections[key] = collection
+        return collection
+    
+    async def ensure_indexes(self):
+        """Create the indexes the application queries rely on (idempotent)"""
+        conversations = self.get_collection("conversations")
+        # Listing order and cursor; _id breaks ties between equal created_at
+        await conversations.create_index([("created_at", -1), ("_id", -1)], name="created_at_id_desc")
+        workflow_cache = self.get_collection("workflow_cache")
+        await workflow_cache.create_index(
+            [("input_hash", 1), ("schema_version", 1)], name="input_hash_version", unique=True
+        )
+        # Cached workflow results expire so a bad result does not live forever
+        await workflow_cache.create_index(
+            [("created_at", 1)], name="created_at_ttl", expireAfterSeconds=self._workflow_cache_ttl
+        )
+        question_pool = self.get_collection("question_pool")
+        await question_pool.create_index([("step", 1), ("level", 1)], name="step_level")
+        logger.info("MongoDB indexes ensured")
     
     def close(self):
-        """Close the MongoDB connection"""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """Close the MongoDB connection owned by the current process"""
+        pid = os.getpid()
+        for key in [key for key in self._collections if key[0] == pid]:
+            del self._collections[key]
+        client = self._clients.pop(pid, None)
+        if client:
+            client.close()
             logger.info("MongoDB connection closed")
 
+    def disconnect(self):
+        """Alias for close(), used by the application shutdown hook"""
+        self.close()
+
 # Create a singleton instance
 mongodb = MongoDB() 
 
+# Per-role message arrays kept alongside "messages" so role-specific reads
+# are a direct projection instead of a scan over the full history
+ROLE_MESSAGE_FIELDS = {
+    "user": "user_messages",
+    "assistant": "assistant_messages"
+}
+ROLE_MESSAGES_LIMIT = 50
+# Cap on the full message history so a conversation document stays bounded
+MESSAGES_LIMIT = 200
+
 
-def get_user_conversation_history(conversation_id: str):
+def build_message_push(*messages: dict) -> dict:
     """
-    Connects to MongoDB, retrieves the last 12 messages for a given conversation ID,
-    filters for 'user' roles, and returns them as a list of dictionaries.
+    Build a $push spec that appends messages to the full history and to the
+    bounded per-role arrays (user_messages / assistant_messages).
     """
-    # Replace with your MongoDB connection details
-    collection = mongodb.get_collection('conversations')
+    push = {"messages": {"$each": list(messages), "$slice": -MESSAGES_LIMIT}}
+    for message in messages:
+        field = ROLE_MESSAGE_FIELDS.get(message.get("role"))
+        if field:
+            push.setdefault(field, {"$each": [], "$slice": -ROLE_MESSAGES_LIMIT})["$each"].append(message)
+    return push
+
+
+# Built once at import; only the _id filter varies per history lookup
+USER_HISTORY_PROJECTION = {
+    "_id": 0,
+    "user_contents": {"$slice": [{"$ifNull": ["$user_messages.content", []]}, -12]}
+}
+
+# Short-lived cache of recent user history per conversation; the UI re-reads
+# the same conversation many times during an active interview
+_history_cache: TTLCache = TTLCache(maxsize=512, ttl=10)
+_history_cache_lock = threading.Lock()
+
+
+def invalidate_user_conversation_history(conversation_id: Union[str, ObjectId]) -> None:
+    """Drop the cached user history for a conversation after new user messages are stored"""
+    with _history_cache_lock:
+        _history_cache.pop(str(conversation_id), None)
+
+
+async def get_user_conversation_history(conversation_id: Union[str, ObjectId]):
+    """
+    Connects to MongoDB, retrieves the last 12 user messages for a given conversation ID
+    and returns them as a list of message contents.
+    """
+    cache_key = str(conversation_id)
+    with _history_cache_lock:
+        cached = _history_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+    
+    collection = mongodb.get_collection('conversations', raw_bson=True)
     try:
-        # MongoDB aggregation pipeline
-        pipeline = [
-            {
-                "$match": {
-                    "_id": ObjectId(conversation_id)
-                }
-            },
-            {
-                "$project": {
-                    "messages": {
-                        "$slice": ["$messages", -12] # Get the last 12 messages
-                    }
-                }
-            },
-            {
-                "$unwind": "$messages" # Deconstruct the messages array
-            },
-            {
-                "$match": {
-                    "messages.role": "user" # Filter by role "user"
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$_id",
-                    "user_messages": {
-                        "$push": "$messages" # Reconstruct the array with only user messages
-                    }
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0, # Exclude the _id field from the final output if not needed
-                    "user_messages": 1
-                }
-            }
-        ]
-
-        result = list(collection.aggregate(pipeline))
-
-        if result and 'user_messages' in result[0]:
-            history_messages = [msg['content'] for msg in result[0]['user_messages']]
-            print("Formatted user history: ",history_messages)
-            return history_messages
-        else:
-            return [] # No messages found or no user messages in the last 12
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return []
\ No newline at end of file
+        object_id = conversation_id if isinstance(conversation_id, ObjectId) else ObjectId(conversation_id)
+        
+        # User messages are stored in their own bounded array; project just the
+        # content strings of the last 12 so timestamps/steps never leave the server
+        conversation = await collection.find_one(
+            {"_id": object_id},
+            projection=USER_HISTORY_PROJECTION
+        )
+
+        if not conversation:
+            return [] # No conversation found
+
+        history_messages = list(conversation.get('user_contents') or [])
+        logger.debug("Formatted user history (%d msgs)", len(history_messages))
+        with _history_cache_lock:
+            _history_cache[cache_key] = tuple(history_messages)
+        return history_messages
+
+    except Exception:
+        logger.exception("Failed to fetch user history for conversation %s", conversation_id)
+        return []
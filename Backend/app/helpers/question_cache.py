@@ -0,0 +1,40 @@
+import random
+import logging
+from typing import Awaitable, Callable, Hashable, List
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionCache:
+    """
+    Per-process cache of generated interview questions.
+    
+    Questions depend only on a small key (step, experience level), so the first
+    few requests for a key fill a pool of variants from the LLM and later ones
+    are answered with a random variant. Entries expire after ttl seconds so the
+    question set keeps refreshing.
+    """
+    
+    def __init__(self, variants_per_key: int = 3, ttl: float = 3600, maxsize: int = 256):
+        self.variants_per_key = variants_per_key
+        self._variants: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    async def get_or_generate(self, key: Hashable, generate: Callable[[], Awaitable[str]]) -> str:
+        """Return a cached variant for key, or generate (and store) a new one"""
+        # Only touched from the event loop thread and never across an await,
+        # so no lock is needed around the dict operations
+        variants: List[str] = self._variants.get(key, [])
+        if len(variants) >= self.variants_per_key:
+            logger.debug("Question cache hit for %s", key)
+            return random.choice(variants)
+        
+        question = await generate()
+        if question:
+            variants = self._variants.get(key, [])
+            if len(variants) < self.variants_per_key:
+                self._variants[key] = variants + [question]
+        return question
+
+
+question_cache = QuestionCache()
\ No newline at end of file
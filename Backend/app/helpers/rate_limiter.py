@@ -0,0 +1,42 @@
+import time
+import asyncio
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket that limits how many operations may start per time period.
+
+    The bucket holds up to max_rate tokens and refills continuously at
+    max_rate per time_period. Each acquisition takes one token and waits for
+    the refill when the bucket is empty, so bursts are smoothed out before they
+    reach the API instead of being rejected by it. Waiters are served in order.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._updated) * self.max_rate / self.time_period
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
@@ -0,0 +1,58 @@
+import logging
+from typing import Any, Hashable, List, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Per-process nearest-neighbour cache keyed by embedding vectors.
+
+    Every entry belongs to a bucket, an exact key that must match before
+    similarity is considered; a lookup only compares vectors within its own
+    bucket. Vectors are L2-normalized on insert, so a single matrix-vector
+    product gives the cosine similarity to every entry. A lookup returns the
+    value of the most similar entry in the bucket if it reaches the
+    threshold. Once maxsize entries are stored, the oldest entry is
+    overwritten.
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 1024, dimension: int = 1536):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._vectors = np.zeros((maxsize, dimension), dtype=np.float32)
+        self._buckets = np.empty(maxsize, dtype=object)
+        self._values: List[Any] = []
+        self._next_slot = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def get(self, bucket: Hashable, vector: Sequence[float]) -> Optional[Any]:
+        """Return the value stored for the most similar vector in bucket, if similar enough"""
+        candidates = np.flatnonzero(self._buckets[:len(self._values)] == bucket)
+        if not candidates.size:
+            return None
+        similarities = self._vectors[candidates] @ self._normalize(vector)
+        position = int(np.argmax(similarities))
+        best = int(candidates[position])
+        similarity = similarities[position]
+        if similarity < self.threshold:
+            return None
+        logger.debug("Semantic cache hit (similarity %.3f)", similarity)
+        return self._values[best]
+
+    def put(self, bucket: Hashable, vector: Sequence[float], value: Any) -> None:
+        """Store value under (bucket, vector), replacing the oldest entry when full"""
+        slot = self._next_slot
+        self._vectors[slot] = self._normalize(vector)
+        self._buckets[slot] = bucket
+        if slot < len(self._values):
+            self._values[slot] = value
+        else:
+            self._values.append(value)
+        self._next_slot = (slot + 1) % self.maxsize
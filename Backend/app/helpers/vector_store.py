@@ -1,4 +1,5 @@
 import os
+import asyncio
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Union, Tuple
 import logging
@@ -21,12 +22,20 @@ CROSS_ENCODER_MODEL = os.getenv("CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-M
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from app.helpers.mongodb import tls_options
 
-def get_mongo_db():
-    client = MongoClient( os.getenv("MONGODB_RAG_URI"), tlsAllowInvalidCertificates=True)
-    db = client[os.getenv('MONGODB_RAG_DB')]
-    collection = db['company-analysis-data']
+# One async client (and connection pool) per worker process
+_rag_collections: Dict[int, AsyncIOMotorCollection] = {}
+
+def get_mongo_db() -> AsyncIOMotorCollection:
+    pid = os.getpid()
+    collection = _rag_collections.get(pid)
+    if collection is None:
+        client = AsyncIOMotorClient(os.getenv("MONGODB_RAG_URI"), **tls_options())
+        db = client[os.getenv('MONGODB_RAG_DB')]
+        collection = db['company-analysis-data']
+        _rag_collections[pid] = collection
     return collection
 
 
@@ -50,7 +59,7 @@ def generate_embeddings(text: str) -> List[float]:
         text = text.replace("\n", " ")  # Remove newline characters for clean input
         return embeddings.embed_query(text)
     except Exception as e:
-        logger.error(f"Error generating embeddings: {e}")
+        logger.error("Error generating embeddings: %s", e)
         return []
 
 def pair_query_with_docs(query: str, retrieved_docs: List[str]) -> List[List[str]]:
@@ -97,7 +106,7 @@ def pair_query_with_docs(query: str, retrieved_docs: List[str]) -> List[List[str
 #         # Return top-k ranked documents
 #         return [doc for _, doc in reranked_docs[:top_k]]
 #     except Exception as e:
-#         logger.error(f"Error reranking documents: {e}")
+#         logger.error("Error reranking documents: %s", e)
 #         return retrieved_docs[:top_k] if retrieved_docs and len(retrieved_docs) > top_k else retrieved_docs
 
 # --- MODIFIED get_document_context function ---
@@ -116,7 +125,8 @@ async def get_document_context(query: str,company_identifier:str = "", top_k: in
         'chunk', 'image_tags' (optional), and 'image_url' (optional).
     """
     try:
-        query_embedding = generate_embeddings(query)
+        # The embeddings client is synchronous; keep it off the event loop
+        query_embedding = await asyncio.to_thread(generate_embeddings, query)
 
         if not query_embedding:
             logger.error("Failed to generate embeddings for query")
@@ -155,7 +165,7 @@ async def get_document_context(query: str,company_identifier:str = "", top_k: in
                 ])
 
             retrieved_documents_data = []
-            for doc in results:
+            async for doc in results:
                 doc_data = {
                     "chunk": doc.get("chunk", "") # Ensure 'chunk' is always present
                 }
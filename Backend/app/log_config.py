@@ -6,6 +6,10 @@ import logging.config
 if not os.path.exists("logs"):
     os.makedirs("logs")
 
+# e.g. LOG_LEVEL=WARNING in production: lazily formatted INFO/DEBUG records
+# are then dropped before their messages are ever built
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 LOGGING_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -16,7 +20,7 @@ LOGGING_CONFIG = {
     },
     'handlers': {
         'default': {
-            'level': 'INFO',
+            'level': LOG_LEVEL,
             'class': 'logging.FileHandler',
             'filename': 'logs/app.log',
             'formatter': 'standard',
@@ -26,7 +30,7 @@ LOGGING_CONFIG = {
     'loggers': {
         '': {
             'handlers': ['default'],
-            'level': 'INFO',
+            'level': LOG_LEVEL,
             'propagate': True
         },
     }
@@ -1,26 +1,51 @@
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 from typing import  Any, Optional, List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
+from typing_extensions import TypedDict
 
 class ApiResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     status_code: int
     message: str
     data: Any
+    next_cursor: Optional[str] = None
 
 class ConversationCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: str = Field(..., example="user@example.com", description="User's email address")
 
 class MessageCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     conversation_id: str = Field(..., example="507f1f77bcf86cd799439011", description="MongoDB ObjectId of the conversation")
     user_message: str = Field(..., example="I have intermediate Excel skills and work with data analysis", description="User's message for Excel interview")
 
+class BulkExcelInterviewItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    user_id: str = Field(..., example="candidate-42", description="Identifier echoed back with this candidate's result")
+    user_query: str = Field(..., example="I have intermediate Excel skills and work with data analysis", description="Candidate's message for the Excel interview")
+
+class BulkExcelInterviewRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    interviews: List[BulkExcelInterviewItem] = Field(..., min_length=1, max_length=100, description="Candidates to interview")
+
 # New models for interactive interview
 class InterviewStepCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     conversation_id: str = Field(..., example="507f1f77bcf86cd799439011", description="MongoDB ObjectId of the conversation")
     user_response: str = Field(..., example="I would use Excel's Remove Duplicates feature", description="User's response to the current question")
     current_step: str = Field(..., example="theory", description="Current interview step: intro, theory, practical, advanced")
 
 class InterviewStepResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     conversation_id: str = Field(..., example="507f1f77bcf86cd799439011", description="MongoDB ObjectId of the conversation")
     current_step: str = Field(..., example="theory", description="Current interview step")
     question: str = Field(..., example="How would you handle duplicate data?", description="Current question being asked")
@@ -29,41 +54,67 @@ class InterviewStepResponse(BaseModel):
     is_complete: bool = Field(..., example=False, description="Whether the interview is complete")
     next_step: Optional[str] = Field(None, example="practical", description="Next step in the interview")
 
+class ResponseEvaluation(TypedDict, total=False):
+    """Evaluation of a single interview answer as produced by the evaluator"""
+    score: float
+    feedback: str
+    strengths: List[str]
+    improvements: List[str]
+
 class InterviewState(BaseModel):
     conversation_id: str
     current_step: str
     completed_steps: List[str]
     responses: Dict[str, str]
-    evaluations: Dict[str, Dict[str, Any]]
+    evaluations: Dict[str, ResponseEvaluation]
     overall_score: Optional[float] = None
     is_complete: bool = False
 
 class PropensityScore(BaseModel):
     """Represents the Excel skill score with visual indicator"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     score: float = Field(..., ge=0, le=10, example=7.0, description="Excel skill score from 0-10")
     rationale: str = Field(..., example="Based on comprehensive Excel skill assessment covering theoretical knowledge, practical application, and advanced features", description="Explanation for the score")
     visual_indicator: str = Field(..., example="🟡 Good", description="Visual indicator: 🟢 Excellent, 🟡 Good, 🟠 Satisfactory, 🔴 Needs Improvement")
 
 class CleanBusinessReportResponse(BaseModel):
     """Clean Excel interview response structure that excludes null fields"""
+    model_config = ConfigDict(extra='ignore', frozen=True, populate_by_name=True)
+
     company_name: str = Field(..., example="Excel Interview - John Doe (Intermediate)", description="Interview identifier with candidate name and level")
     report_date: datetime = Field(..., example="2025-07-08T05:13:25Z", description="Timestamp of the interview")
     propensity_score: PropensityScore = Field(..., description="Excel skill score with detailed assessment")
     overall_summary: str = Field(..., example="Candidate demonstrated strong Excel skills...", description="Overall interview summary and feedback")
-    
-    class Config:
-        # Exclude fields that are None
-        exclude_none = True
+
+# msgspec mirrors of the report models: server-built responses are encoded
+# directly with msgspec.json; the Pydantic models above document the schema.
+# Structs are slotted; gc=False also keeps these acyclic per-request objects
+# out of the cyclic garbage collector
+class PropensityScoreStruct(msgspec.Struct, frozen=True, gc=False):
+    score: float
+    rationale: str
+    visual_indicator: str
+
+class BusinessReportStruct(msgspec.Struct, frozen=True, gc=False):
+    company_name: str
+    report_date: datetime
+    propensity_score: PropensityScoreStruct
+    overall_summary: str
 
 class MessageResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     conversation_id: str = Field(..., example="507f1f77bcf86cd799439011", description="MongoDB ObjectId of the conversation")
     response: str = Field(..., example="Analysis completed...", description="Response content")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, example="2025-07-08T05:13:25Z", description="Response timestamp")
+    timestamp: datetime = Field(default_factory=partial(datetime.now, timezone.utc), example="2025-07-08T05:13:25Z", description="Response timestamp")
 
 class ConversationResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     conversation_id: str = Field(..., example="507f1f77bcf86cd799439011", description="MongoDB ObjectId of the conversation")
     email: str = Field(..., example="user@example.com", description="User's email address")
-    created_at: datetime = Field(default_factory=datetime.utcnow, example="2025-07-08T05:13:25Z", description="Conversation creation timestamp")
+    created_at: datetime = Field(default_factory=partial(datetime.now, timezone.utc), example="2025-07-08T05:13:25Z", description="Conversation creation timestamp")
     status: str = Field(default="active", example="active", description="Conversation status")
 
 
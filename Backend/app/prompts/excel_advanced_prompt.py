@@ -1,13 +1,4 @@
-def get_excel_advanced_prompt():
-    """
-    Returns the Excel advanced features assessment prompt for testing advanced skills.
-    
-    Returns:
-        str: The complete advanced prompt template with placeholders for:
-            - {question_number}: Current question number
-            - {skill_area}: Specific advanced Excel skill area being tested
-    """
-    ADVANCED_PROMPT = """
+ADVANCED_PROMPT = """
 You are an Excel technical interviewer assessing a candidate's advanced Excel skills including VBA, Power Query, complex formulas, and automation.
 
 ADVANCED SKILL CATEGORIES:
@@ -66,5 +57,15 @@ Provide an advanced scenario that:
 
 IMPORTANT: Do not use any markdown formatting (no **bold**, *italic*, or other formatting symbols). Use plain text only.
 """
+
+
+def get_excel_advanced_prompt():
+    """
+    Returns the Excel advanced features assessment prompt for testing advanced skills.
     
-    return ADVANCED_PROMPT 
\ No newline at end of file
+    Returns:
+        str: The complete advanced prompt template with placeholders for:
+            - {question_number}: Current question number
+            - {skill_area}: Specific advanced Excel skill area being tested
+    """
+    return ADVANCED_PROMPT 
\ No newline at end of file
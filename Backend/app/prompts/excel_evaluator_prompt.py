@@ -1,13 +1,4 @@
-def get_excel_evaluator_prompt():
-    """
-    Returns the Excel interview evaluator prompt for assessing candidate responses and providing feedback.
-    
-    Returns:
-        str: The complete evaluator prompt template with placeholders for:
-            - {candidate_responses}: All candidate responses from the interview
-            - {question_areas}: Different skill areas tested
-    """
-    EVALUATOR_PROMPT = """
+EVALUATOR_PROMPT = """
 You are a senior Excel technical interviewer evaluating a candidate's performance across multiple skill areas. Your role is to provide a comprehensive assessment and constructive feedback.
 
 EVALUATION FRAMEWORK:
@@ -102,5 +93,15 @@ EVALUATION CRITERIA:
 - Actionability of recommendations
 - Professional tone and constructive approach
 """
+
+
+def get_excel_evaluator_prompt():
+    """
+    Returns the Excel interview evaluator prompt for assessing candidate responses and providing feedback.
     
-    return EVALUATOR_PROMPT 
\ No newline at end of file
+    Returns:
+        str: The complete evaluator prompt template with placeholders for:
+            - {candidate_responses}: All candidate responses from the interview
+            - {question_areas}: Different skill areas tested
+    """
+    return EVALUATOR_PROMPT 
\ No newline at end of file
@@ -1,13 +1,7 @@
-def get_excel_interview_intro_prompt(intro_message):
-    """
-    Returns the Excel interview introduction prompt that sets the tone and explains the process.
-    
-    Returns:
-        str: The complete introduction prompt template with placeholders for:
-            - {candidate_name}: Candidate's name (if provided)
-            - {interview_level}: Basic, Intermediate, or Advanced
-    """
-    INTRO_PROMPT = """
+from functools import lru_cache
+
+
+INTRO_PROMPT_TEMPLATE = """
 You are an experienced Excel technical interviewer conducting a professional interview. Your role is to welcome the candidate and explain the interview process clearly and professionally.
 
 INTERVIEW INTRODUCTION SCRIPT:
@@ -44,5 +38,17 @@ Provide a welcoming introduction that includes:
 
 IMPORTANT: Do not use any markdown formatting (no **bold**, *italic*, or other formatting symbols). Use plain text only.
 """
+
+
+@lru_cache(maxsize=32)
+def get_excel_interview_intro_prompt(intro_message):
+    """
+    Returns the Excel interview introduction prompt that sets the tone and explains the process.
+    
+    Args:
+        intro_message: Personalised welcome text inserted into the introduction script
     
-    return INTRO_PROMPT 
\ No newline at end of file
+    Returns:
+        str: The complete introduction prompt with the intro message filled in
+    """
+    return INTRO_PROMPT_TEMPLATE.format(intro_message=intro_message)
\ No newline at end of file
@@ -1,13 +1,4 @@
-def get_excel_practical_prompt():
-    """
-    Returns the Excel practical assessment prompt for testing hands-on skills.
-    
-    Returns:
-        str: The complete practical prompt template with placeholders for:
-            - {question_number}: Current question number
-            - {skill_area}: Specific Excel skill area being tested
-    """
-    PRACTICAL_PROMPT = """
+PRACTICAL_PROMPT = """
 You are an Excel technical interviewer assessing a candidate's practical Excel skills through scenario-based questions and formula writing.
 
 PRACTICAL QUESTION CATEGORIES:
@@ -63,5 +54,15 @@ Provide a practical scenario that:
 
 IMPORTANT: Do not use any markdown formatting (no **bold**, *italic*, or other formatting symbols). Use plain text only.
 """
+
+
+def get_excel_practical_prompt():
+    """
+    Returns the Excel practical assessment prompt for testing hands-on skills.
     
-    return PRACTICAL_PROMPT 
\ No newline at end of file
+    Returns:
+        str: The complete practical prompt template with placeholders for:
+            - {question_number}: Current question number
+            - {skill_area}: Specific Excel skill area being tested
+    """
+    return PRACTICAL_PROMPT 
\ No newline at end of file
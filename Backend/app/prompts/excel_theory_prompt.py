@@ -1,13 +1,4 @@
-def get_excel_theory_prompt():
-    """
-    Returns the Excel theory assessment prompt for testing conceptual knowledge.
-    
-    Returns:
-        str: The complete theory prompt template with placeholders for:
-            - {question_number}: Current question number
-            - {skill_area}: Specific Excel skill area being tested
-    """
-    THEORY_PROMPT = """
+THEORY_PROMPT = """
 You are an Excel technical interviewer assessing a candidate's theoretical knowledge of Excel concepts, functions, and best practices.
 
 QUESTION CATEGORIES:
@@ -56,5 +47,15 @@ Provide a question that:
 
 IMPORTANT: Do not use any markdown formatting (no **bold**, *italic*, or other formatting symbols). Use plain text only.
 """
+
+
+def get_excel_theory_prompt():
+    """
+    Returns the Excel theory assessment prompt for testing conceptual knowledge.
     
-    return THEORY_PROMPT 
\ No newline at end of file
+    Returns:
+        str: The complete theory prompt template with placeholders for:
+            - {question_number}: Current question number
+            - {skill_area}: Specific Excel skill area being tested
+    """
+    return THEORY_PROMPT 
\ No newline at end of file
@@ -1,56 +1,62 @@
 # The corrected code:
 import logging
-from app.services.conversation_service import conversation_service
-from app.workflows.Excel_Interview_workflow import run_excel_interview_workflow
-import pytz
-from datetime import datetime
+import httpx
+import msgspec
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import PyMongoError
+from app.services.conversation_service import (
+    InterviewStepConflict,
+    InterviewWorkflowError,
+    InvalidInterviewInput,
+    conversation_service
+)
+from app.workflows.Excel_Interview_workflow import run_many_excel_interviews, get_visual_indicator
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
 from app.models.schema import (
     ApiResponse,
     ConversationCreate,
     ConversationResponse,
     MessageCreate,
     MessageResponse,
+    BulkExcelInterviewRequest,
     CleanBusinessReportResponse,
-    PropensityScore,
+    PropensityScoreStruct,
+    BusinessReportStruct,
     InterviewStepCreate,
     InterviewStepResponse,
     InterviewState
 )
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
 # Configure logger
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Resolved once; the health check is polled frequently by load balancers
+IST = ZoneInfo("Asia/Kolkata")
+
 
 @router.get("/server-check")
 def health_check():
-    try:
-        # Get current time in IST
-        ist = pytz.timezone('Asia/Kolkata')
-        current_time = datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"Server check endpoint hit at {current_time}")
+    # Get current time in IST
+    current_time = datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    logger.info("Server check endpoint hit at %s", current_time)
 
-        return ApiResponse(
-            status_code=200,
-            message="Server check successful. Welcome to AI Excel Interview System!",
-            data={
-                "serverName": "AI Excel Interview System",
-                "timestamp": current_time
-            }
-        )
-
-    except Exception as e:
-        print(e)
-        logger.error(f"An ERROR occurred in the Server check: {e}")
-        return ApiResponse(
-            status_code=500,
-            message="Server check failed.",
-            data={}
-        )
+    return ApiResponse(
+        status_code=200,
+        message="Server check successful. Welcome to AI Excel Interview System!",
+        data={
+            "serverName": "AI Excel Interview System",
+            "timestamp": current_time
+        }
+    )
 
 
-@router.post("/", response_model=ConversationResponse)
+@router.post("/", responses={200: {"model": ConversationResponse}})
 async def create_conversation(conversation_data: ConversationCreate):
     """
     Create a new conversation
@@ -58,34 +64,54 @@ async def create_conversation(conversation_data: ConversationCreate):
     """
     logger.info("Create conversations endpoint accessed !")
     try:
-        result = conversation_service.create_conversation(conversation_data.email)
-        response = ConversationResponse(
-            conversation_id=result["conversation_id"],
-            email=result["email"],
-            created_at=result["created_at"],
-            status=result["status"]
-        )
-        logger.info(f"API logs fetched successfully. Response: {response}")
+        result = await conversation_service.create_conversation(conversation_data.email)
+        response = {
+            "conversation_id": result["conversation_id"],
+            "email": result["email"],
+            "created_at": result["created_at"],
+            "status": result["status"]
+        }
         return response
     except Exception as e:
-        logger.error(f"Error creating conversation: {e}")
+        logger.error("Error creating conversation: %s", e)
         raise
 
 
+def parse_conversation_cursor(cursor: str) -> Tuple[datetime, Optional[ObjectId]]:
+    """
+    Parse a /get_conversations cursor, "<created_at ISO>|<conversation_id>".
+    A bare timestamp (older clients) is accepted without the id.
+    """
+    created_at, _, conversation_id = cursor.partition("|")
+    return datetime.fromisoformat(created_at), ObjectId(conversation_id) if conversation_id else None
+
+
 @router.get("/get_conversations")
-async def get_conversation_history():
+async def get_conversation_history(
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
     logger.info("Get conversation history endpoint accessed !")
     try:
-        conversations = conversation_service.get_all_conversations()
+        cursor = parse_conversation_cursor(after) if after else None
+    except (ValueError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        conversations = await conversation_service.get_all_conversations(limit, cursor)
+        # A short page means there is nothing left to fetch
+        next_cursor = None
+        if len(conversations) == limit:
+            last = conversations[-1]
+            next_cursor = f"{last['created_at'].isoformat()}|{last['conversation_id']}"
         response = ApiResponse(
             status_code=200,
             message="Conversations retrieved successfully",
-            data=conversations
+            data=conversations,
+            next_cursor=next_cursor
         )
-        logger.info(f"API logs fetched successfully. Response: {response}")
         return response
     except Exception as e:
-        logger.error(f"Error getting conversations: {e}")
+        logger.error("Error getting conversations: %s", e)
         return ApiResponse(
             status_code=500,
             message="Error retrieving conversations",
@@ -93,7 +119,7 @@ async def get_conversation_history():
         )
 
 
-@router.post("/excel-interview", response_model=CleanBusinessReportResponse)
+@router.post("/excel-interview", responses={200: {"model": CleanBusinessReportResponse}})
 async def start_excel_interview(message_data: MessageCreate):
     """
     Start an Excel technical interview
@@ -117,47 +143,63 @@ async def start_excel_interview(message_data: MessageCreate):
         response_text = result.get("response", "Interview completed")
         evaluation = result.get("evaluation", {})
         candidate_info = result.get("candidate_info", {})
-        timestamp = result.get("timestamp", datetime.utcnow())
+        timestamp = result.get("timestamp", datetime.now(timezone.utc))
         
         # Extract overall score from evaluation
         overall_score = evaluation.get('overall_score', 7) if evaluation else 7
         
         # Determine visual indicator based on score
-        if overall_score >= 8:
-            visual_indicator = "🟢 Excellent"
-        elif overall_score >= 6:
-            visual_indicator = "🟡 Good"
-        elif overall_score >= 4:
-            visual_indicator = "🟠 Satisfactory"
-        else:
-            visual_indicator = "🔴 Needs Improvement"
+        visual_indicator = get_visual_indicator(overall_score)
         
         candidate_name = candidate_info.get('name', 'Candidate') if candidate_info else 'Candidate'
         experience_level = candidate_info.get('experience_level', 'Intermediate') if candidate_info else 'Intermediate'
         
-        return CleanBusinessReportResponse(
+        # Server-generated data: skip Pydantic and encode the struct in one pass
+        report = BusinessReportStruct(
             company_name=f"Excel Interview - {candidate_name} ({experience_level})",
             report_date=timestamp,
-            propensity_score=PropensityScore(
+            propensity_score=PropensityScoreStruct(
                 score=overall_score,
-                rationale=f"Based on comprehensive Excel skill assessment covering theoretical knowledge, practical application, and advanced features",
+                rationale="Based on comprehensive Excel skill assessment covering theoretical knowledge, practical application, and advanced features",
                 visual_indicator=visual_indicator
             ),
             overall_summary=response_text
         )
+        return Response(content=msgspec.json.encode(report), media_type="application/json")
         
-    except Exception as e:
-        logger.error(f"Error in Excel interview endpoint: {e}")
-        return CleanBusinessReportResponse(
-            company_name="Excel Interview - Error",
-            report_date=datetime.utcnow(),
-            propensity_score=PropensityScore(
-                score=0,
-                rationale="Error occurred during interview",
-                visual_indicator="🔴 Error"
-            ),
-            overall_summary=f"Error: {str(e)}"
-        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid conversation_id")
+    except InvalidInterviewInput as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except (ValueError, InterviewWorkflowError, PyMongoError, httpx.HTTPError) as e:
+        logger.error("Error in Excel interview endpoint: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail={"error": str(e), "stage": "excel_interview"}
+        ) from e
+
+
+@router.post("/excel-interviews/stream")
+async def stream_excel_interviews(request: BulkExcelInterviewRequest):
+    """
+    Run Excel interviews for a batch of candidates concurrently.
+    Streams each result as a server-sent event as soon as it is ready; results
+    arrive in completion order and carry the user_id they belong to.
+    """
+    logger.info("Bulk Excel interview endpoint accessed for %d candidates", len(request.interviews))
+    items = [
+        {"user_query": item.user_query, "user_id": item.user_id, "message_id": "1"}
+        for item in request.interviews
+    ]
+    
+    async def events():
+        async for result in run_many_excel_interviews(items):
+            # The traceback of a failed run is logged by the workflow; clients
+            # only get the error message
+            result.pop("error_details", None)
+            yield b"data: " + msgspec.json.encode(result) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 # New Interactive Interview Endpoints
@@ -185,11 +227,55 @@ async def start_interactive_interview(message_data: MessageCreate):
             next_step=result["next_step"]
         )
         
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid conversation_id")
     except Exception as e:
-        logger.error(f"Error in start interactive interview endpoint: {e}")
+        logger.error("Error in start interactive interview endpoint: %s", e)
         raise
 
 
+@router.post("/start-interactive-interview/stream")
+async def stream_interactive_interview(message_data: MessageCreate):
+    """
+    Start an interactive Excel interview, streaming the introduction as
+    server-sent events: one "data" event per text chunk ({"delta": ...}),
+    then a "done" event with the same body as /start-interactive-interview.
+    """
+    logger.info("Stream interactive interview endpoint accessed !")
+    try:
+        # Reject malformed ids before the stream starts
+        ObjectId(message_data.conversation_id)
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid conversation_id")
+    
+    async def events():
+        try:
+            async for event in conversation_service.stream_interactive_interview(
+                message_data.conversation_id,
+                message_data.user_message
+            ):
+                if "delta" in event:
+                    yield b"data: " + msgspec.json.encode(event) + b"\n\n"
+                else:
+                    result = event["result"]
+                    response = InterviewStepResponse(
+                        conversation_id=result["conversation_id"],
+                        current_step=result["current_step"],
+                        question=result["question"],
+                        previous_response=None,
+                        evaluation=None,
+                        is_complete=result["is_complete"],
+                        next_step=result["next_step"]
+                    )
+                    yield b"event: done\ndata: " + response.model_dump_json().encode() + b"\n\n"
+        except (ValueError, PyMongoError, httpx.HTTPError) as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error("Error in stream interactive interview endpoint: %s", e)
+            yield b"event: error\ndata: " + msgspec.json.encode({"error": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.post("/process-interview-step", response_model=InterviewStepResponse)
 async def process_interview_step(step_data: InterviewStepCreate):
     """
@@ -214,8 +300,12 @@ async def process_interview_step(step_data: InterviewStepCreate):
             next_step=result.get("next_step")
         )
         
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid conversation_id")
+    except InterviewStepConflict as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:
-        logger.error(f"Error in process interview step endpoint: {e}")
+        logger.error("Error in process interview step endpoint: %s", e)
         raise
 
 
@@ -224,9 +314,9 @@ async def get_interview_state(conversation_id: str):
     """
     Get the current interview state for a conversation
     """
-    logger.info(f"Get interview state endpoint accessed for conversation: {conversation_id}")
+    logger.info("Get interview state endpoint accessed for conversation: %s", conversation_id)
     try:
-        interview_state = conversation_service.get_interview_state(conversation_id)
+        interview_state = await conversation_service.get_interview_state(conversation_id)
         
         return ApiResponse(
             status_code=200,
@@ -234,8 +324,10 @@ async def get_interview_state(conversation_id: str):
             data=interview_state
         )
         
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid conversation_id")
     except Exception as e:
-        logger.error(f"Error getting interview state: {e}")
+        logger.error("Error getting interview state: %s", e)
         return ApiResponse(
             status_code=500,
             message="Error retrieving interview state",
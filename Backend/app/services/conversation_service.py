@@ -1,17 +1,52 @@
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from datetime import datetime, timezone
 from bson import ObjectId
-from app.helpers.mongodb import mongodb
-from app.workflows.Excel_Interview_workflow import run_excel_interview_workflow, start_interactive_interview, process_interview_step
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.helpers.mongodb import mongodb, build_message_push, invalidate_user_conversation_history
+from app.workflows.Excel_Interview_workflow import (
+    INVALID_INPUT_ERROR,
+    run_excel_interview_workflow,
+    start_interactive_interview,
+    stream_interactive_interview,
+    process_interview_step,
+    step_read_projection
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or result shape change so stale cached results are ignored
+WORKFLOW_CACHE_VERSION = 3
+
+class InterviewStepConflict(Exception):
+    """Another answer advanced the interview while this one was being processed"""
+
+class InvalidInterviewInput(ValueError):
+    """The interview request was rejected before the workflow ran"""
+
+class InterviewWorkflowError(RuntimeError):
+    """The interview workflow failed and returned no usable result"""
+
 class ConversationService:
     def __init__(self):
         self.collection_name = "conversations"
+        self.workflow_cache_collection_name = "workflow_cache"
     
-    def create_conversation(self, email: str) -> Dict[str, Any]:
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        """Conversations collection on the current process's pooled client"""
+        # Resolved lazily: the service is built at import time, which may be
+        # before a pre-fork worker has its own client
+        return mongodb.get_collection(self.collection_name)
+    
+    @property
+    def workflow_cache(self) -> AsyncIOMotorCollection:
+        """Workflow result cache collection"""
+        return mongodb.get_collection(self.workflow_cache_collection_name)
+    
+    async def create_conversation(self, email: str) -> Dict[str, Any]:
         """
         Create a new conversation
         
@@ -22,11 +57,13 @@ class ConversationService:
             Dict containing conversation_id, email, and created_at
         """
         try:
-            collection = mongodb.get_collection(self.collection_name)
+            collection = self.collection
             conversation_data = {
                 "email": email,
-                "created_at": datetime.utcnow(),
+                "created_at": datetime.now(timezone.utc),
                 "messages": [],
+                "user_messages": [],
+                "assistant_messages": [],
                 "interview_type": "excel",
                 "status": "active",
                 "interview_state": {
@@ -38,10 +75,10 @@ class ConversationService:
                 }
             }
             
-            result = collection.insert_one(conversation_data)
+            result = await collection.insert_one(conversation_data)
             conversation_id = str(result.inserted_id)
             
-            logger.info(f"Created new conversation: {conversation_id} for email: {email}")
+            logger.info("Created new conversation: %s for email: %s", conversation_id, email)
             
             return {
                 "conversation_id": conversation_id,
@@ -50,7 +87,7 @@ class ConversationService:
                 "status": "active"
             }
         except Exception as e:
-            logger.error(f"Error creating conversation: {e}")
+            logger.error("Error creating conversation: %s", e)
             raise
     
     async def start_interactive_interview(self, conversation_id: str, user_message: str) -> Dict[str, Any]:
@@ -65,41 +102,67 @@ class ConversationService:
             Dict containing the first question and interview state
         """
         try:
-            # Verify that the conversation exists
-            collection = mongodb.get_collection(self.collection_name)
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
-            
-            if not conversation:
-                raise ValueError(f"Conversation with ID {conversation_id} not found")
+            # Parse (and validate) the id once, before any LLM or DB work
+            oid = ObjectId(conversation_id)
+            now = datetime.now(timezone.utc)
             
             # Start the interactive interview
-            logger.info(f"Starting interactive Excel interview for conversation: {conversation_id}")
+            logger.info("Starting interactive Excel interview for conversation: %s", conversation_id)
             interview_result = await start_interactive_interview(user_message, conversation_id)
             
-            # Update conversation with interview state
-            collection.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {
-                    "$set": {
-                        "interview_state": interview_result["interview_state"],
-                        "interview_started": True,
-                        "started_at": datetime.utcnow()
-                    },
-                    "$push": {"messages": {
-                        "role": "assistant",
-                        "content": interview_result["question"],
-                        "timestamp": datetime.utcnow(),
-                        "step": "intro"
-                    }}
-                }
-            )
-            
+            await self._store_interview_start(oid, interview_result, now)
             return interview_result
             
         except Exception as e:
-            logger.error(f"Error starting interactive interview: {e}")
+            logger.error("Error starting interactive interview: %s", e)
             raise
     
+    async def stream_interactive_interview(self, conversation_id: str, user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Start an interactive Excel interview, streaming the introduction
+        
+        Args:
+            conversation_id: Conversation ID
+            user_message: User's initial message
+            
+        Yields:
+            {"delta": text} events for the introduction, then {"result": ...}
+            once the interview state has been stored
+        """
+        # Parse (and validate) the id before any LLM work
+        oid = ObjectId(conversation_id)
+        now = datetime.now(timezone.utc)
+        
+        logger.info("Streaming interactive Excel interview start for conversation: %s", conversation_id)
+        async for event in stream_interactive_interview(user_message, conversation_id):
+            if "result" in event:
+                await self._store_interview_start(oid, event["result"], now)
+            yield event
+    
+    async def _store_interview_start(self, oid: ObjectId, interview_result: Dict[str, Any], now: datetime) -> None:
+        """Store the initial interview state and the introduction message"""
+        result = await self.collection.update_one(
+            {"_id": oid},
+            {
+                "$set": {
+                    "interview_state": interview_result["interview_state"],
+                    # Upcoming questions live outside interview_state, which the
+                    # candidate can read back
+                    "prefetched_questions": interview_result["prefetched_questions"],
+                    "interview_started": True,
+                    "started_at": now
+                },
+                "$push": build_message_push({
+                    "role": "assistant",
+                    "content": interview_result["question"],
+                    "timestamp": now,
+                    "step": "intro"
+                })
+            }
+        )
+        if result.matched_count == 0:
+            raise ValueError(f"Conversation with ID {oid} not found")
+    
     async def process_interview_step(self, conversation_id: str, user_response: str, current_step: str) -> Dict[str, Any]:
         """
         Process a user's response to an interview question and get the next question
@@ -113,52 +176,92 @@ class ConversationService:
             Dict containing evaluation, next question, and updated state
         """
         try:
-            # Verify that the conversation exists
-            collection = mongodb.get_collection(self.collection_name)
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
-            
-            if not conversation:
-                raise ValueError(f"Conversation with ID {conversation_id} not found")
-            
-            # Process the interview step
-            logger.info(f"Processing interview step {current_step} for conversation: {conversation_id}")
-            step_result = await process_interview_step(conversation_id, user_response, current_step)
-            
-            # Update conversation with new state
-            collection.update_one(
-                {"_id": ObjectId(conversation_id)},
+            oid = ObjectId(conversation_id)
+            collection = self.collection
+            now = datetime.now(timezone.utc)
+            
+            # Store the user's answer and read back the state the step needs in
+            # one atomic round trip; also rejects unknown conversations up front.
+            # Of the messages only the latest question asked for this step is
+            # returned
+            conversation = await collection.find_one_and_update(
+                {"_id": oid},
                 {
-                    "$set": {
-                        "interview_state": step_result["interview_state"],
-                        "last_updated": datetime.utcnow()
-                    },
-                    "$push": {"messages": {
+                    "$push": build_message_push({
                         "role": "user",
                         "content": user_response,
-                        "timestamp": datetime.utcnow(),
+                        "timestamp": now,
                         "step": current_step
-                    }}
-                }
+                    }),
+                    "$set": {"last_updated": now}
+                },
+                projection=step_read_projection(current_step),
+                return_document=ReturnDocument.AFTER
             )
-            
-            # If there's a next question, add it to messages
-            if not step_result["is_complete"] and step_result.get("next_question"):
-                collection.update_one(
-                    {"_id": ObjectId(conversation_id)},
-                    {"$push": {"messages": {
+            if conversation is None:
+                raise ValueError(f"Conversation with ID {conversation_id} not found")
+            invalidate_user_conversation_history(conversation_id)
+            question_read = conversation.get("interview_state", {}).get("current_question")
+            
+            try:
+                # Process the interview step
+                logger.info("Processing interview step %s for conversation: %s", current_step, conversation_id)
+                step_result = await process_interview_step(conversation_id, user_response, current_step, conversation, now)
+                
+                # Store the new state together with the next question (if any)
+                update: Dict[str, Any] = {
+                    "$set": {
+                        "interview_state": step_result["interview_state"],
+                        "last_updated": now
+                    }
+                }
+                if step_result.get("next_step"):
+                    # The next question has now been asked; drop its prefetched copy
+                    update["$unset"] = {f"prefetched_questions.{step_result['next_step']}": ""}
+                if not step_result["is_complete"] and step_result.get("next_question"):
+                    update["$push"] = build_message_push({
                         "role": "assistant",
                         "content": step_result["next_question"],
-                        "timestamp": datetime.utcnow(),
+                        "timestamp": now,
                         "step": step_result["next_step"]
-                    }}}
+                    })
+                
+                # Only applies if no other answer advanced the interview since the
+                # state was read, so two concurrent answers cannot overwrite each
+                # other
+                result = await collection.update_one(
+                    {"_id": oid, "interview_state.current_question": question_read},
+                    update
                 )
+                if result.matched_count == 0:
+                    raise InterviewStepConflict(
+                        f"Conversation {conversation_id} was advanced by another answer"
+                    )
+            except Exception:
+                # The step was not recorded, so neither is the answer; otherwise
+                # a retry would store it twice
+                await self._withdraw_answer(oid, current_step, now)
+                raise
             
             return step_result
             
         except Exception as e:
-            logger.error(f"Error processing interview step: {e}")
+            logger.error("Error processing interview step: %s", e)
             raise
     
+    async def _withdraw_answer(self, oid: ObjectId, step: str, timestamp: datetime) -> None:
+        """Remove an answer stored by process_interview_step whose step was not recorded"""
+        stored_answer = {"role": "user", "timestamp": timestamp, "step": step}
+        try:
+            await self.collection.update_one(
+                {"_id": oid},
+                {"$pull": {"messages": stored_answer, "user_messages": stored_answer}}
+            )
+        except Exception as e:
+            # Best effort: the caller re-raises the error that failed the step
+            logger.error("Could not withdraw answer for conversation %s: %s", oid, e)
+        invalidate_user_conversation_history(oid)
+    
     async def start_excel_interview(self, conversation_id: str, user_message: str) -> Dict[str, Any]:
         """
         Start an Excel interview and return the response (legacy method for backward compatibility)
@@ -171,56 +274,82 @@ class ConversationService:
             Dict containing interview results and conversation updates
         """
         try:
-            # Verify that the conversation exists
-            collection = mongodb.get_collection(self.collection_name)
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+            oid = ObjectId(conversation_id)
+            collection = self.collection
             
-            if not conversation:
-                raise ValueError(f"Conversation with ID {conversation_id} not found")
+            timestamp = datetime.now(timezone.utc)
             
-            # Store the user message in the conversation history
-            timestamp = datetime.utcnow()
-            collection.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {"$push": {"messages": {
-                    "role": "user",
-                    "content": user_message,
-                    "timestamp": timestamp
-                }}}
-            )
-            
-            # Run the Excel interview workflow
-            logger.info(f"Starting Excel interview for conversation: {conversation_id}")
-            workflow_result = await run_excel_interview_workflow(
-                user_message, 
-                conversation_id, 
-                "1"
+            # Reuse a previous result for an identical interview request
+            input_hash = hashlib.sha256(user_message.encode("utf-8")).hexdigest()
+            cache_collection = self.workflow_cache
+            cached = await cache_collection.find_one(
+                {"input_hash": input_hash, "schema_version": WORKFLOW_CACHE_VERSION},
+                projection={"_id": 0, "feedback": 1, "evaluation": 1, "candidate_info": 1}
             )
             
-            # Extract the response from workflow result
-            if hasattr(workflow_result, 'result') and workflow_result.result:
-                # Handle workflow object with result attribute
-                interview_response = workflow_result.result.get("feedback", "Interview completed")
-                evaluation = workflow_result.result.get("evaluation", {})
-                candidate_info = workflow_result.result.get("candidate_info", {})
-            elif isinstance(workflow_result, dict):
-                # Handle direct dictionary result
-                interview_response = workflow_result.get("feedback", "Interview completed")
-                evaluation = workflow_result.get("evaluation", {})
-                candidate_info = workflow_result.get("candidate_info", {})
+            if cached:
+                logger.info("Using cached Excel interview result for conversation: %s", conversation_id)
+                interview_response = cached.get("feedback", "Interview completed")
+                evaluation = cached.get("evaluation", {})
+                candidate_info = cached.get("candidate_info", {})
             else:
-                interview_response = str(workflow_result) if workflow_result else "Interview completed"
-                evaluation = {}
-                candidate_info = {}
-            
-            # Store the AI response in the conversation history
-            collection.update_one(
-                {"_id": ObjectId(conversation_id)},
-                {"$push": {"messages": {
+                # Run the Excel interview workflow
+                logger.info("Starting Excel interview for conversation: %s", conversation_id)
+                workflow_result = await run_excel_interview_workflow(
+                    user_message, 
+                    conversation_id, 
+                    "1"
+                )
+                
+                # Failed runs are reported, never stored as a completed interview
+                if isinstance(workflow_result, dict) and "error" in workflow_result:
+                    if workflow_result["error"] == INVALID_INPUT_ERROR:
+                        raise InvalidInterviewInput(workflow_result["feedback"])
+                    raise InterviewWorkflowError(workflow_result["error"])
+                
+                # Extract the response from workflow result
+                if hasattr(workflow_result, 'result') and workflow_result.result:
+                    # Handle workflow object with result attribute
+                    interview_response = workflow_result.result.get("feedback", "Interview completed")
+                    evaluation = workflow_result.result.get("evaluation", {})
+                    candidate_info = workflow_result.result.get("candidate_info", {})
+                elif isinstance(workflow_result, dict):
+                    # Handle direct dictionary result
+                    interview_response = workflow_result.get("feedback", "Interview completed")
+                    evaluation = workflow_result.get("evaluation", {})
+                    candidate_info = workflow_result.get("candidate_info", {})
+                else:
+                    interview_response = str(workflow_result) if workflow_result else "Interview completed"
+                    evaluation = {}
+                    candidate_info = {}
+                
+                # Only cache successful runs (failed ones raised above); a run
+                # with a placeholder evaluation is a transient failure, not a
+                # result to serve for this input from now on
+                if isinstance(workflow_result, dict) and not workflow_result.get("used_fallback_evaluation"):
+                    await cache_collection.update_one(
+                        {"input_hash": input_hash, "schema_version": WORKFLOW_CACHE_VERSION},
+                        {"$setOnInsert": {
+                            "feedback": interview_response,
+                            "evaluation": evaluation,
+                            "candidate_info": candidate_info,
+                            "created_at": timestamp
+                        }},
+                        upsert=True
+                    )
+            
+            # Store the user message and the AI response in the conversation history
+            result = await collection.update_one(
+                {"_id": oid},
+                {"$push": build_message_push({
+                    "role": "user",
+                    "content": user_message,
+                    "timestamp": timestamp
+                }, {
                     "role": "assistant",
                     "content": interview_response,
                     "timestamp": timestamp
-                }},
+                }),
                 "$set": {
                     "interview_completed": True,
                     "evaluation": evaluation,
@@ -228,8 +357,11 @@ class ConversationService:
                     "completed_at": timestamp
                 }}
             )
+            if result.matched_count == 0:
+                raise ValueError(f"Conversation with ID {conversation_id} not found")
+            invalidate_user_conversation_history(conversation_id)
             
-            logger.info(f"Excel interview completed for conversation: {conversation_id}")
+            logger.info("Excel interview completed for conversation: %s", conversation_id)
             
             return {
                 "conversation_id": conversation_id,
@@ -240,10 +372,10 @@ class ConversationService:
             }
             
         except Exception as e:
-            logger.error(f"Error in Excel interview: {e}")
+            logger.error("Error in Excel interview: %s", e)
             raise
     
-    def get_interview_state(self, conversation_id: str) -> Dict[str, Any]:
+    async def get_interview_state(self, conversation_id: str) -> Dict[str, Any]:
         """
         Get the current interview state for a conversation
         
@@ -254,12 +386,16 @@ class ConversationService:
             Dict containing interview state
         """
         try:
-            collection = mongodb.get_collection(self.collection_name)
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+            oid = ObjectId(conversation_id)
+            collection = self.collection
+            # _id lookup; only the state is read, not the message history
+            conversation = await collection.find_one({"_id": oid}, {"interview_state": 1})
             
             if not conversation:
                 raise ValueError(f"Conversation with ID {conversation_id} not found")
             
+            # Older interviews kept the upcoming questions inside the state
+            conversation.get("interview_state", {}).pop("prefetched_questions", None)
             return conversation.get("interview_state", {
                 "current_step": "intro",
                 "completed_steps": [],
@@ -269,10 +405,10 @@ class ConversationService:
             })
             
         except Exception as e:
-            logger.error(f"Error getting interview state: {e}")
+            logger.error("Error getting interview state: %s", e)
             raise
     
-    def get_conversation_history(self, conversation_id: str) -> Dict[str, Any]:
+    async def get_conversation_history(self, conversation_id: str) -> Dict[str, Any]:
         """
         Get conversation history and details
         
@@ -283,8 +419,14 @@ class ConversationService:
             Dict containing conversation details and message history
         """
         try:
-            collection = mongodb.get_collection(self.collection_name)
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+            oid = ObjectId(conversation_id)
+            collection = self.collection
+            # Everything except the upcoming questions (older interviews kept
+            # them inside interview_state)
+            conversation = await collection.find_one(
+                {"_id": oid},
+                {"prefetched_questions": 0, "interview_state.prefetched_questions": 0}
+            )
             
             if not conversation:
                 raise ValueError(f"Conversation with ID {conversation_id} not found")
@@ -303,22 +445,53 @@ class ConversationService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting conversation history: {e}")
+            logger.error("Error getting conversation history: %s", e)
             raise
     
-    def get_all_conversations(self) -> List[Dict[str, Any]]:
+    async def get_all_conversations(self, limit: int = 50,
+                                    after: Optional[Tuple[datetime, Optional[ObjectId]]] = None) -> List[Dict[str, Any]]:
         """
-        Get all conversations
+        Get a page of conversations, newest first
         
+        Args:
+            limit: Maximum number of conversations to return
+            after: Cursor from the previous page, (created_at, _id) of its last
+                conversation; only conversations after it in the listing order
+                are returned. Without an _id every conversation created at
+                that timestamp is skipped
+            
         Returns:
             List of conversation summaries
         """
         try:
-            collection = mongodb.get_collection(self.collection_name)
-            conversations = list(collection.find().sort("created_at", -1))
+            collection = self.collection
+            match: Dict[str, Any] = {}
+            if after:
+                created_at, last_id = after
+                match = {"created_at": {"$lt": created_at}}
+                if last_id is not None:
+                    match = {"$or": [match, {"created_at": created_at, "_id": {"$lt": last_id}}]}
+            # Only summary fields are sent back; the message array is reduced
+            # to its length on the server
+            pipeline = [
+                {"$match": match},
+                {"$sort": {"created_at": -1, "_id": -1}},
+                {"$limit": limit},
+                {"$project": {
+                    "email": 1,
+                    "created_at": 1,
+                    "status": 1,
+                    "interview_type": 1,
+                    "interview_completed": 1,
+                    "interview_state": 1,
+                    "message_count": {"$size": {"$ifNull": ["$messages", []]}}
+                }},
+                # Older interviews kept the upcoming questions inside the state
+                {"$unset": "interview_state.prefetched_questions"}
+            ]
             
             result = []
-            for conv in conversations:
+            async for conv in collection.aggregate(pipeline):
                 result.append({
                     "conversation_id": str(conv["_id"]),
                     "email": conv.get("email"),
@@ -327,16 +500,16 @@ class ConversationService:
                     "interview_type": conv.get("interview_type"),
                     "interview_completed": conv.get("interview_completed", False),
                     "interview_state": conv.get("interview_state", {}),
-                    "message_count": len(conv.get("messages", []))
+                    "message_count": conv.get("message_count", 0)
                 })
             
             return result
             
         except Exception as e:
-            logger.error(f"Error getting all conversations: {e}")
+            logger.error("Error getting all conversations: %s", e)
             raise
     
-    def update_conversation_status(self, conversation_id: str, status: str) -> bool:
+    async def update_conversation_status(self, conversation_id: str, status: str) -> bool:
         """
         Update conversation status
         
@@ -348,16 +521,17 @@ class ConversationService:
             True if successful, False otherwise
         """
         try:
-            collection = mongodb.get_collection(self.collection_name)
-            result = collection.update_one(
-                {"_id": ObjectId(conversation_id)},
+            oid = ObjectId(conversation_id)
+            collection = self.collection
+            result = await collection.update_one(
+                {"_id": oid},
                 {"$set": {"status": status}}
             )
             
             return result.modified_count > 0
             
         except Exception as e:
-            logger.error(f"Error updating conversation status: {e}")
+            logger.error("Error updating conversation status: %s", e)
             return False
 
 # Singleton instance
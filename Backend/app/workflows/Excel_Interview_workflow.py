@@ -1,100 +1,535 @@
 import os
+import re
 import asyncio
-import json
+import orjson
 import time
-from typing import Any, Dict, List, Tuple, Optional
-from llama_index.llms.openai import OpenAI
-from llama_index.core.workflow import InputRequiredEvent, HumanResponseEvent
+import httpx
+import hashlib
+import traceback
+from functools import lru_cache
+from statistics import StatisticsError, fmean
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Tuple, Optional
 import dotenv
+from cachetools import TTLCache
+from pydantic import TypeAdapter, ValidationError
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from app.helpers.mongodb import mongodb
+from app.helpers.question_cache import question_cache
+from app.helpers.rate_limiter import AsyncRateLimiter
+from app.helpers.semantic_cache import SemanticCache
+from app.models.schema import ResponseEvaluation
 from app.prompts.excel_interview_intro_prompt import get_excel_interview_intro_prompt
 from app.prompts.excel_theory_prompt import get_excel_theory_prompt
 from app.prompts.excel_practical_prompt import get_excel_practical_prompt
 from app.prompts.excel_advanced_prompt import get_excel_advanced_prompt
-from app.prompts.excel_evaluator_prompt import get_excel_evaluator_prompt
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
-# Load environment variables
-dotenv.load_dotenv()
+if TYPE_CHECKING:
+    from llama_index.embeddings.openai import OpenAIEmbedding
+    from llama_index.llms.openai import OpenAI
+
+# Load environment variables, unless the environment (or an earlier import
+# in this process) already provides the key
+if not os.getenv("OPENAI_API_KEY"):
+    dotenv.load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Configuration and initialization
+# Static prompts, resolved once per process so every call sends the same string
+THEORY_PROMPT = get_excel_theory_prompt()
+PRACTICAL_PROMPT = get_excel_practical_prompt()
+ADVANCED_PROMPT = get_excel_advanced_prompt()
+# The candidate's level is sent in the user message instead of being written
+# into the script, so the intro prompt is the same for every candidate
+INTRO_PROMPT = get_excel_interview_intro_prompt(
+    "Based on your profile, I'll be assessing your Excel skills at the candidate level given below.\n"
+    "This interview will cover theoretical knowledge, practical application, and advanced features.\n\n"
+    "Let's begin with understanding your Excel experience better."
+)
+INTRO_INSTRUCTION = "Generate a welcoming introduction and first question:"
+
+# Configuration and initialization, resolved once at import
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+if not OPENAI_API_KEY:
+    logger.warning("OPENAI_API_KEY is not set; interview LLM calls will fail")
+
+# Shared async HTTP client so every LLM call reuses one connection pool;
+# closed from the application lifespan on shutdown
+llm_http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(60.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
+# LlamaIndex is imported on first use rather than at module import, so
+# importing this module for helpers like get_visual_indicator stays cheap
+@lru_cache(maxsize=None)
+def get_llm() -> "OpenAI":
+    """Get the process-wide OpenAI LLM, building it on first use"""
+    from llama_index.llms.openai import OpenAI
+    return OpenAI(model="gpt-4o-mini", api_key=OPENAI_API_KEY, async_http_client=llm_http_client)
+
+@lru_cache(maxsize=None)
+def get_embed_model() -> "OpenAIEmbedding":
+    """Get the process-wide OpenAI embedding model, building it on first use"""
+    from llama_index.embeddings.openai import OpenAIEmbedding
+    return OpenAIEmbedding(model="text-embedding-3-small", api_key=OPENAI_API_KEY, async_http_client=llm_http_client)
+
+def chat_messages(system_prompt: str, user_content: str) -> list:
+    """Build the [system, user] message list for a chat call"""
+    from llama_index.core.llms import ChatMessage
+    return [
+        ChatMessage(role="system", content=system_prompt),
+        ChatMessage(role="user", content=user_content)
+    ]
+
+# OPENAI_MAX_CONCURRENCY and OPENAI_MAX_RPM are totals for the whole server;
+# each worker process (WEB_CONCURRENCY, exported by main.py) gets an equal share
+WORKER_COUNT = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+# Caps in-flight OpenAI requests so concurrent interviews (and the gathered
+# calls within one) queue here instead of tripping 429 rate limits
+llm_semaphore = asyncio.Semaphore(max(1, int(os.getenv("OPENAI_MAX_CONCURRENCY", "20")) // WORKER_COUNT))
+# Paces request starts below the account's requests-per-minute limit, so
+# bursts wait here rather than failing and backing off
+llm_rate_limiter = AsyncRateLimiter(float(os.getenv("OPENAI_MAX_RPM", "500")) / WORKER_COUNT, time_period=60)
+
+async def generate_text(system_prompt: str, user_content: str) -> str:
+    """
+    Run a chat completion with the instructions as the system message and the
+    per-request details last, so identical instruction prefixes are served
+    from OpenAI's prompt cache.
+    """
+    async with llm_semaphore, llm_rate_limiter:
+        response = await get_llm().achat(chat_messages(system_prompt, user_content))
+    return response.message.content or ""
+
+async def stream_text(system_prompt: str, user_content: str) -> AsyncIterator[str]:
+    """
+    Stream a chat completion (same message layout as generate_text), yielding
+    text deltas as they arrive so callers can forward them before the
+    generation finishes.
+    """
+    async with llm_semaphore, llm_rate_limiter:
+        stream = await get_llm().astream_chat(chat_messages(system_prompt, user_content))
+        async for chunk in stream:
+            if chunk.delta:
+                yield chunk.delta
+
+@lru_cache(maxsize=None)
+def get_encoding():
+    """Tokenizer of the interview model, loaded once on first use"""
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens model tokens, marking cuts with '...'"""
+    # Every token covers at least one character, so short text needs no encoding
+    if len(text) <= max_tokens:
+        return text
+    encoding = get_encoding()
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]) + "..."
+
+# f-string expressions cannot contain a backslash before Python 3.12
+NEWLINE = "\n"
+
+# System prompt and instruction used to generate the question for each step
+QUESTION_STEPS = {
+    "theory": (THEORY_PROMPT, "Generate a theory question appropriate for this level:"),
+    "practical": (PRACTICAL_PROMPT, "Generate a practical scenario question:"),
+    "advanced": (ADVANCED_PROMPT, "Generate an advanced Excel question:"),
+    "advanced2": (ADVANCED_PROMPT, "Generate a different advanced Excel question focusing on data analysis:"),
+    "advanced3": (ADVANCED_PROMPT, "Generate a final advanced Excel question focusing on automation and efficiency:"),
+}
 
-# Initialize OpenAI LLM
-llm = OpenAI(model="gpt-4o-mini", api_key=OPENAI_API_KEY)
+# Fixed interview sequence and the step that follows each one (None after the last)
+INTERVIEW_STEPS = ("intro", *QUESTION_STEPS)
+NEXT_STEP = dict(zip(INTERVIEW_STEPS, INTERVIEW_STEPS[1:] + (None,)))
+
+# Pre-generated questions (see scripts/prepopulate_questions.py), one
+# document per question: {step, level, text, used_count, created_at}
+QUESTION_POOL_COLLECTION = "question_pool"
+
+def question_generation_prompt(step: str, experience_level: str) -> Tuple[str, str]:
+    """System prompt and user message that generate a question for a step"""
+    system_prompt, instruction = QUESTION_STEPS[step]
+    return system_prompt, f"Experience Level: {experience_level}\n\n{instruction}"
+
+async def get_pooled_question(step: str, experience_level: str) -> Optional[str]:
+    """Pick a random pre-generated question for the step and level, if the pool has any"""
+    try:
+        pool = mongodb.get_collection(QUESTION_POOL_COLLECTION)
+        async for question in pool.aggregate([
+            {"$match": {"step": step, "level": experience_level}},
+            {"$sample": {"size": 1}},
+            {"$project": {"text": 1}}
+        ]):
+            await pool.update_one({"_id": question["_id"]}, {"$inc": {"used_count": 1}})
+            return question["text"]
+    except PyMongoError as e:
+        logger.warning("Question pool lookup failed, generating instead: %s", e)
+    return None
+
+async def generate_question(step: str, experience_level: str) -> str:
+    """
+    Get a question for an interview step: from the pre-generated pool when
+    available, otherwise generated (and cached per level) by the LLM.
+    """
+    pooled_question = await get_pooled_question(step, experience_level)
+    if pooled_question:
+        return pooled_question
+    
+    system_prompt, user_content = question_generation_prompt(step, experience_level)
+    return await question_cache.get_or_generate(
+        (step, experience_level),
+        lambda: generate_text(system_prompt, user_content)
+    )
+
+# Static part of the single-call interview setup: all question-writing
+# guidelines up front, so the prefix is shared by every candidate
+INTERVIEW_PACKAGE_PROMPT = (
+    "You prepare a complete Excel interview in one pass, following each set of guidelines below.\n\n"
+    f"THEORY QUESTION GUIDELINES:\n{THEORY_PROMPT}\n\n"
+    f"PRACTICAL QUESTION GUIDELINES:\n{PRACTICAL_PROMPT}\n\n"
+    f"ADVANCED QUESTION GUIDELINES:\n{ADVANCED_PROMPT}\n\n"
+    'Respond with a JSON object with exactly these string fields: '
+    '{"intro": "<welcoming introduction and first question>", "theory": "<theory question>", '
+    '"practical": "<practical scenario question>", "advanced": "<advanced Excel question>"}'
+)
+
+async def generate_interview_package(intro_prompt: str, experience_level: str) -> Tuple[str, str, str, str]:
+    """
+    Generate the introduction and the theory, practical and advanced questions
+    with a single JSON-mode call. Falls back to one (concurrent) call per
+    question if the combined response cannot be used.
+    """
+    try:
+        async with llm_semaphore, llm_rate_limiter:
+            response = await get_llm().achat(
+                chat_messages(
+                    INTERVIEW_PACKAGE_PROMPT,
+                    f"INTRODUCTION GUIDELINES:\n{intro_prompt}\n\nExperience Level: {experience_level}"
+                ),
+                response_format={"type": "json_object"}
+            )
+        package = orjson.loads(response.message.content or "")
+        return package["intro"], package["theory"], package["practical"], package["advanced"]
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        logger.warning("Combined interview generation unusable, generating questions separately: %s", e)
+    
+    return await asyncio.gather(
+        generate_text(
+            intro_prompt,
+            f"Candidate Level: {experience_level}\n\n{INTRO_INSTRUCTION}"
+        ),
+        generate_question("theory", experience_level),
+        generate_question("practical", experience_level),
+        generate_question("advanced", experience_level)
+    )
+
+# Visual indicator per whole score 0-10: <4 needs improvement, 4-5 satisfactory,
+# 6-7 good, 8+ excellent
+VISUAL_INDICATORS = (
+    ("🔴 Needs Improvement",) * 4
+    + ("🟠 Satisfactory",) * 2
+    + ("🟡 Good",) * 2
+    + ("🟢 Excellent",) * 3
+)
+
+def get_visual_indicator(score: float) -> str:
+    """
+    Map an overall score (0-10) to its visual indicator.
+    """
+    return VISUAL_INDICATORS[max(0, min(int(score), 10))]
+
+def average_score(evaluations: Iterable[Dict[str, Any]]) -> float:
+    """
+    Mean score of a set of evaluations (missing scores count as 7), or 7.0
+    when there are none.
+    """
+    # fmean consumes the generator in a single pass
+    try:
+        return fmean(evaluation.get("score", 7) for evaluation in evaluations)
+    except StatisticsError:
+        return 7.0
+
+EXPERIENCE_LEVELS = ("basic", "intermediate", "advanced", "beginner", "expert")
+
+# Compiled once; matched case-insensitively against the raw query
+EXPERIENCE_LEVEL_RE = re.compile(rf"\b({'|'.join(EXPERIENCE_LEVELS)})\b", re.IGNORECASE)
 
 def extract_candidate_info(user_query: str) -> Tuple[str, str]:
     """
     Extract candidate name and experience level from user query.
     """
     # Simple extraction - can be enhanced with more sophisticated parsing
-    experience_levels = ["basic", "intermediate", "advanced", "beginner", "expert"]
-    
-    query_lower = user_query.lower()
-    level = "intermediate"  # default
+    match = EXPERIENCE_LEVEL_RE.search(user_query)
+    level = match.group(1).lower() if match else "intermediate"  # default
     
-    for exp_level in experience_levels:
-        if exp_level in query_lower:
-            level = exp_level
-            break
-    
-    # Extract name if provided (simple pattern matching)
-    name = "Candidate"  # default
-    if "name" in query_lower or "i'm" in query_lower or "i am" in query_lower:
-        # Basic name extraction - can be enhanced
-        name = "Candidate"
+    # Name extraction is not implemented yet; every candidate is "Candidate"
+    name = "Candidate"
     
     return name, level
 
+# Validates evaluator output against the schema while parsing it
+response_evaluation_adapter = TypeAdapter(ResponseEvaluation)
+
+# Structured-output schemas: with strict mode the model can only emit JSON
+# matching these, so evaluations no longer depend on the prompt's example
+EVALUATION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number"},
+        "feedback": {"type": "string"},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+        "improvements": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["score", "feedback", "strengths", "improvements"],
+    "additionalProperties": False
+}
+EVALUATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "evaluation", "schema": EVALUATION_JSON_SCHEMA, "strict": True}
+}
+EVALUATIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "evaluations",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "evaluations": {
+                    "type": "array",
+                    "items": {
+                        **EVALUATION_JSON_SCHEMA,
+                        "properties": {"index": {"type": "integer"}, **EVALUATION_JSON_SCHEMA["properties"]},
+                        "required": ["index", *EVALUATION_JSON_SCHEMA["required"]]
+                    }
+                }
+            },
+            "required": ["evaluations"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}
+
+# Static instructions for per-answer evaluation; the answer details go in the
+# user message so this prefix is identical across calls
+RESPONSE_EVALUATION_PROMPT = """You are an Excel technical interviewer evaluating a candidate's response.
+
+Please evaluate this response on a scale of 1-10 and provide:
+1. Score (1-10)
+2. Brief feedback on strengths and areas for improvement
+3. Key points they covered well
+4. What they could improve
+
+Respond in compact JSON format:
+{"score": <number>, "feedback": "<brief feedback>", "strengths": ["<point1>", "<point2>"], "improvements": ["<improvement1>", "<improvement2>"]}"""
+
+# Exact-match cache of successful evaluations; retries, demos and the simulated
+# answers of the one-shot workflow repeat the same (question, answer) pairs
+evaluation_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+def evaluation_cache_key(question: str, user_response: str, question_type: str, experience_level: str) -> str:
+    """Digest identifying an evaluation request in evaluation_cache"""
+    return hashlib.blake2b(
+        "\x1f".join((question, user_response, question_type, experience_level)).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+
+# Opt-in second tier: an answer that only paraphrases an earlier answer to the
+# exact same question, type and level reuses its evaluation when the
+# embeddings of the two answers are at least this similar. Only the answer is
+# embedded; answers to different questions are never compared
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_EVALUATION_CACHE = os.getenv("SEMANTIC_EVALUATION_CACHE", "false").lower() == "true"
+semantic_evaluation_cache = SemanticCache(threshold=SEMANTIC_CACHE_THRESHOLD) if SEMANTIC_EVALUATION_CACHE else None
+
+def evaluation_question_key(question: str, question_type: str, experience_level: str) -> str:
+    """Digest of the question an answer is evaluated against (its semantic cache bucket)"""
+    return hashlib.blake2b(
+        "\x1f".join((question, question_type, experience_level)).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+
+async def embed_user_response(user_response: str) -> Optional[List[float]]:
+    """Embed a candidate answer for the semantic cache; None if embedding fails"""
+    try:
+        return await get_embed_model().aget_text_embedding(user_response)
+    except Exception as e:
+        logger.warning("Could not embed candidate answer, skipping semantic cache: %s", e)
+        return None
+
+def format_response_details(question: str, user_response: str, question_type: str, experience_level: str) -> str:
+    """
+    Build the per-answer part of an evaluation request (sent after
+    RESPONSE_EVALUATION_PROMPT).
+    """
+    # No indentation or padding: every whitespace run is billed as prompt tokens
+    return (
+        f"Question Type: {question_type}\n"
+        f"Experience Level: {experience_level}\n"
+        f"Question: {question}\n"
+        f"Candidate Response: {user_response}"
+    )
+
+def fallback_evaluation() -> Dict[str, Any]:
+    """Neutral evaluation returned when an answer could not be evaluated"""
+    return {
+        "score": 7,
+        "feedback": "Response evaluated",
+        "strengths": ["Provided a response"],
+        "improvements": ["Could provide more detail"]
+    }
+
+def is_fallback_evaluation(evaluation: Dict[str, Any]) -> bool:
+    """Whether an evaluation is the placeholder from fallback_evaluation()"""
+    return evaluation == fallback_evaluation()
+
 async def evaluate_response(question: str, user_response: str, question_type: str, experience_level: str) -> Dict[str, Any]:
     """
     Evaluate a single user response to an interview question.
     """
-    evaluation_prompt = f"""
-    You are an Excel technical interviewer evaluating a candidate's response.
+    cache_key = evaluation_cache_key(question, user_response, question_type, experience_level)
+    cached = evaluation_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    Question Type: {question_type}
-    Experience Level: {experience_level}
-    Question: {question}
-    Candidate Response: {user_response}
+    embedding = None
+    if semantic_evaluation_cache is not None:
+        question_key = evaluation_question_key(question, question_type, experience_level)
+        embedding = await embed_user_response(user_response)
+        cached = semantic_evaluation_cache.get(question_key, embedding) if embedding else None
+        if cached is not None:
+            evaluation_cache[cache_key] = cached
+            return cached
     
-    Please evaluate this response on a scale of 1-10 and provide:
-    1. Score (1-10)
-    2. Brief feedback on strengths and areas for improvement
-    3. Key points they covered well
-    4. What they could improve
+    response_details = format_response_details(question, user_response, question_type, experience_level)
     
-    Respond in JSON format:
-    {{
-        "score": <number>,
-        "feedback": "<brief feedback>",
-        "strengths": ["<point1>", "<point2>"],
-        "improvements": ["<improvement1>", "<improvement2>"]
-    }}
+    try:
+        async with llm_semaphore, llm_rate_limiter:
+            response = await get_llm().achat(
+                chat_messages(RESPONSE_EVALUATION_PROMPT, response_details),
+                response_format=EVALUATION_RESPONSE_FORMAT
+            )
+        evaluation = response_evaluation_adapter.validate_python(orjson.loads(response.message.content or ""))
+        evaluation_cache[cache_key] = evaluation
+        if embedding:
+            semantic_evaluation_cache.put(question_key, embedding, evaluation)
+        return evaluation
+    except Exception as e:
+        logger.error("Error evaluating response: %s", e)
+        return fallback_evaluation()
+
+# Static instructions for evaluating several answers in one call
+RESPONSES_EVALUATION_PROMPT = """You are an Excel technical interviewer evaluating a candidate's responses to several questions.
+
+Please evaluate each numbered response on a scale of 1-10 and provide:
+1. Score (1-10)
+2. Brief feedback on strengths and areas for improvement
+3. Key points they covered well
+4. What they could improve
+
+Respond in compact JSON format with one entry per response:
+{"evaluations": [{"index": <response number>, "score": <number>, "feedback": "<brief feedback>", "strengths": ["<point1>", "<point2>"], "improvements": ["<improvement1>", "<improvement2>"]}]}"""
+
+async def evaluate_responses(items: List[Tuple[str, str, str]], experience_level: str) -> List[Dict[str, Any]]:
     """
+    Evaluate several (question, user_response, question_type) answers with a
+    single JSON-mode call, returning the evaluations in input order. Answers
+    found in evaluation_cache are not sent again. Falls back to one
+    (concurrent) evaluate_response call per answer if the combined response
+    cannot be used.
+    """
+    cache_keys = [
+        evaluation_cache_key(question, user_response, question_type, experience_level)
+        for question, user_response, question_type in items
+    ]
+    results: List[Optional[Dict[str, Any]]] = [evaluation_cache.get(cache_key) for cache_key in cache_keys]
+    pending = [position for position, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+    
+    response_details = f"Experience Level: {experience_level}\n\n" + "\n\n".join(
+        f"Response {index}:\n"
+        f"Question Type: {items[position][2]}\n"
+        f"Question: {items[position][0]}\n"
+        f"Candidate Response: {items[position][1]}"
+        for index, position in enumerate(pending, 1)
+    )
     
     try:
-        evaluation_response = await llm.acomplete(evaluation_prompt)
-        # Try to parse JSON response
-        evaluation_text = evaluation_response.text.strip()
-        if evaluation_text.startswith('```json'):
-            evaluation_text = evaluation_text[7:-3]  # Remove ```json and ```
-        elif evaluation_text.startswith('```'):
-            evaluation_text = evaluation_text[3:-3]  # Remove ``` and ```
-        
-        evaluation_data = json.loads(evaluation_text)
-        return evaluation_data
-    except Exception as e:
-        logger.error(f"Error evaluating response: {e}")
-        # Fallback evaluation
-        return {
-            "score": 7,
-            "feedback": "Response evaluated",
-            "strengths": ["Provided a response"],
-            "improvements": ["Could provide more detail"]
+        async with llm_semaphore, llm_rate_limiter:
+            response = await get_llm().achat(
+                chat_messages(RESPONSES_EVALUATION_PROMPT, response_details),
+                response_format=EVALUATIONS_RESPONSE_FORMAT
+            )
+        evaluations = {
+            evaluation["index"]: evaluation
+            for evaluation in orjson.loads(response.message.content or "")["evaluations"]
         }
+        # The TypedDict schema drops the index key
+        fresh = [response_evaluation_adapter.validate_python(evaluations[index]) for index in range(1, len(pending) + 1)]
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValidationError) as e:
+        logger.warning("Combined evaluation unusable, evaluating responses separately: %s", e)
+        fresh = await asyncio.gather(*(
+            evaluate_response(items[position][0], items[position][1], items[position][2], experience_level)
+            for position in pending
+        ))
+    else:
+        for position, evaluation in zip(pending, fresh):
+            evaluation_cache[cache_keys[position]] = evaluation
+    
+    for position, evaluation in zip(pending, fresh):
+        results[position] = evaluation
+    return results
+
+def build_interview_start(conversation_id: str, candidate_name: str, experience_level: str,
+                          intro_response: str, questions: List[str]) -> Dict[str, Any]:
+    """
+    Build the start-of-interview result: the first question, the initial
+    interview state and the pre-generated questions for the later steps.
+    
+    The pre-generated questions are kept out of interview_state, which is
+    returned to the candidate, and are stored in a conversation field of
+    their own.
+    """
+    # Create initial interview state with 6 total questions
+    interview_state = {
+        "conversation_id": conversation_id,
+        "current_step": "intro",
+        "completed_steps": [],
+        "responses": {},
+        "evaluations": {},
+        "total_questions": 6,
+        "current_question": 1,
+        "candidate_info": {
+            "name": candidate_name,
+            "experience_level": experience_level
+        },
+        "is_complete": False,
+        "qa_pairs": []  # Initialize Q&A pairs storage
+    }
+    
+    # The caller persists interview_state together with the first question
+    logger.info("Initialized interview state for conversation %s", conversation_id)
+    
+    return {
+        "conversation_id": conversation_id,
+        "question": intro_response,
+        "current_step": "intro",
+        "next_step": "theory",
+        "interview_state": interview_state,
+        "prefetched_questions": dict(zip(QUESTION_STEPS, questions)),
+        "is_complete": False,
+        "total_questions": 6,
+        "current_question": 1,
+        "questions_remaining": 5
+    }
 
 async def start_interactive_interview(user_message: str, conversation_id: str) -> Dict[str, Any]:
     """
@@ -110,72 +545,79 @@ async def start_interactive_interview(user_message: str, conversation_id: str) -
     try:
         # Extract candidate information
         candidate_name, experience_level = extract_candidate_info(user_message)
-        logger.info(f"Starting interactive Excel interview for {candidate_name} (Level: {experience_level})")
-        
-        # Create introduction message
-        intro_message = f"""
-        Welcome to your Excel technical interview! 
-        
-        Based on your profile, I'll be assessing your {experience_level} level Excel skills.
-        This interview will cover theoretical knowledge, practical application, and advanced features.
+        logger.info("Starting interactive Excel interview for %s (Level: %s)", candidate_name, experience_level)
         
-        Let's begin with understanding your Excel experience better.
-        """
-        
-        # Get intro prompt
-        intro_prompt = get_excel_interview_intro_prompt(intro_message)
-        
-        # Generate first question
-        intro_response = await llm.acomplete(
-            f"{intro_prompt}\n\nCandidate Level: {experience_level}\n\nGenerate a welcoming introduction and first question:"
-        )
-        
-        # Create initial interview state with 6 total questions
-        interview_state = {
-            "conversation_id": conversation_id,
-            "current_step": "intro",
-            "completed_steps": [],
-            "responses": {},
-            "evaluations": {},
-            "total_questions": 6,
-            "current_question": 1,
-            "candidate_info": {
-                "name": candidate_name,
-                "experience_level": experience_level
-            },
-            "is_complete": False,
-            "qa_pairs": []  # Initialize Q&A pairs storage
-        }
-        
-        # Store the initial interview state in MongoDB
-        from app.helpers.mongodb import mongodb
-        from bson import ObjectId
-        collection = mongodb.get_collection("conversations")
-        
-        collection.update_one(
-            {"_id": ObjectId(conversation_id)},
-            {"$set": {"interview_state": interview_state}}
+        # Generate the introduction together with every later question: they
+        # only depend on the level, so each step then just waits for its evaluation
+        intro_response, *questions = await asyncio.gather(
+            generate_text(INTRO_PROMPT, f"Candidate Level: {experience_level}\n\n{INTRO_INSTRUCTION}"),
+            *(generate_question(step, experience_level) for step in QUESTION_STEPS)
         )
         
-        logger.info(f"Initialized interview state for conversation {conversation_id}")
-        
-        return {
-            "conversation_id": conversation_id,
-            "question": intro_response.text,
-            "current_step": "intro",
-            "next_step": "theory",
-            "interview_state": interview_state,
-            "is_complete": False,
-            "total_questions": 6,
-            "current_question": 1,
-            "questions_remaining": 5
-        }
+        return build_interview_start(conversation_id, candidate_name, experience_level, intro_response, questions)
         
     except Exception as e:
-        logger.error(f"Error starting interactive interview: {e}")
+        logger.error("Error starting interactive interview: %s", e)
         raise
 
-async def process_interview_step(conversation_id: str, user_response: str, current_step: str) -> Dict[str, Any]:
+async def stream_interactive_interview(user_message: str, conversation_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Start an interactive Excel interview, streaming the introduction as it is
+    generated.
+    
+    Yields {"delta": text} for each piece of the introduction, then a final
+    {"result": ...} with the same content start_interactive_interview returns.
+    """
+    candidate_name, experience_level = extract_candidate_info(user_message)
+    logger.info("Streaming interactive Excel interview start for %s (Level: %s)", candidate_name, experience_level)
+    
+    # Later questions are generated while the introduction streams
+    questions_task = asyncio.ensure_future(asyncio.gather(
+        *(generate_question(step, experience_level) for step in QUESTION_STEPS)
+    ))
+    try:
+        intro_parts = []
+        async for delta in stream_text(INTRO_PROMPT, f"Candidate Level: {experience_level}\n\n{INTRO_INSTRUCTION}"):
+            intro_parts.append(delta)
+            yield {"delta": delta}
+        questions = await questions_task
+    finally:
+        if not questions_task.done():
+            questions_task.cancel()
+    
+    yield {"result": build_interview_start(
+        conversation_id, candidate_name, experience_level, "".join(intro_parts), questions
+    )}
+
+def step_read_projection(step: str) -> Dict[str, Any]:
+    """
+    Projection for the per-step read: the interview state, the prefetched
+    questions and, as messages, the most recent assistant message for step.
+    """
+    return {
+        "interview_state": 1,
+        "prefetched_questions": 1,
+        # Most recent rather than first: a restarted interview asks every step
+        # again on the same conversation. The outer $ifNull keeps the $slice
+        # an aggregation expression instead of the $slice projection operator
+        "messages": {"$ifNull": [
+            {"$slice": [
+                {"$filter": {
+                    "input": {"$ifNull": ["$messages", []]},
+                    "cond": {"$and": [
+                        {"$eq": ["$$this.role", "assistant"]},
+                        {"$eq": ["$$this.step", step]}
+                    ]}
+                }},
+                -1
+            ]},
+            []
+        ]}
+    }
+
+async def process_interview_step(conversation_id: str, user_response: str, current_step: str,
+                                 conversation: Optional[Dict[str, Any]] = None,
+                                 now: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Process a user's response to an interview question and get the next question.
     
@@ -183,16 +625,24 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         conversation_id: Conversation ID
         user_response: User's response to the current question
         current_step: Current interview step (intro, theory, practical, advanced)
+        conversation: Already-fetched conversation, projected with
+            step_read_projection(current_step); read from MongoDB when not
+            provided
+        now: UTC time of the step, shared with the messages the caller
+            stores; defaults to the current time
         
     Returns:
         Dict containing evaluation, next question, and updated state
     """
+    next_question_task = None
     try:
-        # Get the current interview state from MongoDB
-        from app.helpers.mongodb import mongodb
-        from bson import ObjectId
-        collection = mongodb.get_collection("conversations")
-        conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+        # Get the current interview state from MongoDB unless the caller
+        # already read it
+        if conversation is None:
+            conversation = await mongodb.get_collection("conversations").find_one(
+                {"_id": ObjectId(conversation_id)},
+                step_read_projection(current_step)
+            )
         
         if not conversation:
             raise ValueError(f"Conversation with ID {conversation_id} not found")
@@ -201,20 +651,17 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         candidate_info = interview_state.get("candidate_info", {})
         experience_level = candidate_info.get("experience_level", "intermediate")
         
-        # Get the question that was asked for this step
-        messages = conversation.get("messages", [])
-        current_question = ""
-        for msg in reversed(messages):
-            if msg.get("step") == current_step and msg.get("role") == "assistant":
-                current_question = msg.get("content", "")
-                break
+        # Get the question that was last asked for this step (the projection
+        # leaves at most that one message)
+        messages = conversation.get("messages") or [{}]
+        current_question = messages[0].get("content", "")
         
         # Store the question and answer in the database
         qa_data = {
             "step": current_step,
             "question": current_question,
             "answer": user_response,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now(timezone.utc)).isoformat()
         }
         
         # Initialize qa_pairs if it doesn't exist
@@ -224,6 +671,23 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         # Add the Q&A pair to the interview state
         interview_state["qa_pairs"].append(qa_data)
         
+        # Determine next step based on question number
+        if current_step not in NEXT_STEP:
+            raise ValueError(f"Unknown interview step: {current_step}")
+        next_step = NEXT_STEP[current_step]
+        current_question_num = interview_state.get("current_question", 1)
+        
+        # Use the question generated at interview start; otherwise (older
+        # interviews) generate it while the answer is being evaluated, since it
+        # does not depend on the evaluation
+        # Interviews started before the questions moved out of interview_state
+        # still carry them there; drop them so they are no longer returned
+        legacy_prefetched = interview_state.pop("prefetched_questions", None)
+        prefetched_questions = conversation.get("prefetched_questions") or legacy_prefetched or {}
+        prefetched_question = prefetched_questions.get(next_step) if next_step else None
+        if prefetched_question is None and next_step in QUESTION_STEPS and current_question_num < 6:
+            next_question_task = asyncio.ensure_future(generate_question(next_step, experience_level))
+        
         # Evaluate the user's response
         evaluation = await evaluate_response(
             current_question,
@@ -237,16 +701,10 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         interview_state["evaluations"][current_step] = evaluation
         interview_state["completed_steps"].append(current_step)
         
-        # Determine next step based on question number
-        steps = ["intro", "theory", "practical", "advanced", "advanced2", "advanced3"]
-        current_index = steps.index(current_step)
-        next_step = steps[current_index + 1] if current_index + 1 < len(steps) else None
-        
         # Update question counter
-        current_question_num = interview_state.get("current_question", 1)
         interview_state["current_question"] = current_question_num + 1
         
-        logger.info(f"Question counter updated: {current_question_num} -> {interview_state['current_question']}")
+        logger.info("Question counter updated: %s -> %s", current_question_num, interview_state['current_question'])
         
         # Generate next question if not complete
         next_question = ""
@@ -256,90 +714,22 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         if next_step and current_question_num < 6:  # Maximum 6 questions
             interview_state["current_step"] = next_step
             questions_remaining = 6 - interview_state["current_question"]
-            logger.info(f"Continuing to next step: {next_step}, questions remaining: {questions_remaining}")
+            logger.info("Continuing to next step: %s, questions remaining: %s", next_step, questions_remaining)
             
-            if next_step == "theory":
-                theory_prompt = get_excel_theory_prompt()
-                theory_response = await llm.acomplete(
-                    f"{theory_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a theory question appropriate for this level:"
-                )
-                next_question = theory_response.text
-                
-            elif next_step == "practical":
-                practical_prompt = get_excel_practical_prompt()
-                practical_response = await llm.acomplete(
-                    f"{practical_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a practical scenario question:"
-                )
-                next_question = practical_response.text
-                
-            elif next_step == "advanced":
-                advanced_prompt = get_excel_advanced_prompt()
-                advanced_response = await llm.acomplete(
-                    f"{advanced_prompt}\n\nExperience Level: {experience_level}\n\nGenerate an advanced Excel question:"
-                )
-                next_question = advanced_response.text
-                
-            elif next_step == "advanced2":
-                advanced_prompt = get_excel_advanced_prompt()
-                advanced_response = await llm.acomplete(
-                    f"{advanced_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a different advanced Excel question focusing on data analysis:"
-                )
-                next_question = advanced_response.text
-                
-            elif next_step == "advanced3":
-                advanced_prompt = get_excel_advanced_prompt()
-                advanced_response = await llm.acomplete(
-                    f"{advanced_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a final advanced Excel question focusing on automation and efficiency:"
-                )
-                next_question = advanced_response.text
+            if prefetched_question is not None:
+                next_question = prefetched_question
+            elif next_question_task is not None:
+                next_question = await next_question_task
         else:
             # Interview is complete - get human approval before generating final results
             is_complete = True
             interview_state["is_complete"] = True
             
-            # Get all Q&A data for human review
-            qa_pairs = interview_state.get("qa_pairs", [])
-            evaluations = interview_state.get("evaluations", {})
-            candidate_info = interview_state.get("candidate_info", {})
-            
-            # Prepare summary for human review
-            review_summary = f"""
-            INTERVIEW COMPLETE - HUMAN REVIEW REQUIRED
-            
-            Candidate: {candidate_info.get('name', 'Unknown')}
-            Experience Level: {candidate_info.get('experience_level', 'Unknown')}
-            Total Questions Answered: {len(qa_pairs)}
-            
-            INTERVIEW SUMMARY:
-            """
-            
-            # Add each Q&A pair to the review summary
-            for i, qa in enumerate(qa_pairs, 1):
-                step = qa.get("step", "unknown")
-                question = qa.get("question", "")
-                answer = qa.get("answer", "")
-                evaluation = evaluations.get(step, {})
-                score = evaluation.get("score", 7)
-                feedback = evaluation.get("feedback", "No feedback available")
-                
-                review_summary += f"""
-            Question {i} ({step.title()}):
-            Q: {question[:150]}{'...' if len(question) > 150 else ''}
-            A: {answer[:150]}{'...' if len(answer) > 150 else ''}
-            Score: {score}/10
-            Feedback: {feedback}
-            """
-            
-            # Calculate preliminary overall score
-            scores = [eval_data.get("score", 7) for eval_data in evaluations.values()]
-            preliminary_score = sum(scores) / len(scores) if scores else 7
-            
-            review_summary += f"""
-            
-            PRELIMINARY OVERALL SCORE: {preliminary_score:.1f}/10
-            
-            Do you approve this interview evaluation and want to generate final results? (yes/no):
-            """
+            # The simulated approval below only logs the review summary at
+            # debug level, so the token truncation is skipped otherwise
+            review_summary = ""
+            if logger.isEnabledFor(logging.DEBUG):
+                review_summary = build_review_summary(candidate_info, interview_state)
             
             # Human-in-the-loop validation
             try:
@@ -349,31 +739,28 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
                 
                 if human_approval:
                     # Generate comprehensive final results using all stored Q&A data
-                    final_results = await generate_final_results_from_qa_data(conversation_id, interview_state)
+                    final_results = await generate_final_results_from_qa_data(
+                        conversation_id, interview_state, candidate_info
+                    )
                     interview_state["final_results"] = final_results
-                    logger.info(f"Human approved final results for conversation {conversation_id}")
+                    logger.info("Human approved final results for conversation %s", conversation_id)
                 else:
                     # Human rejected the evaluation
                     interview_state["human_rejected"] = True
                     interview_state["rejection_reason"] = "Human reviewer did not approve the evaluation"
-                    logger.info(f"Human rejected final results for conversation {conversation_id}")
+                    logger.info("Human rejected final results for conversation %s", conversation_id)
                     
             except Exception as e:
-                logger.error(f"Error in human approval process: {e}")
+                logger.error("Error in human approval process: %s", e)
                 # Fallback: generate results without human approval
-                final_results = await generate_final_results_from_qa_data(conversation_id, interview_state)
+                final_results = await generate_final_results_from_qa_data(
+                    conversation_id, interview_state, candidate_info
+                )
                 interview_state["final_results"] = final_results
                 interview_state["human_approval_bypassed"] = True
         
-        # Update the conversation in MongoDB with the new interview state
-        collection.update_one(
-            {"_id": ObjectId(conversation_id)},
-            {"$set": {"interview_state": interview_state}}
-        )
-        
-        logger.info(f"MongoDB updated with new interview state: current_question={interview_state['current_question']}")
-        
-        logger.info(f"Returning to frontend: current_question={interview_state['current_question']}, questions_remaining={questions_remaining}")
+        # The caller persists interview_state together with the step's messages
+        logger.debug("Returning to frontend: current_question=%s, questions_remaining=%s", interview_state['current_question'], questions_remaining)
         
         return {
             "conversation_id": conversation_id,
@@ -394,8 +781,26 @@ async def process_interview_step(conversation_id: str, user_response: str, curre
         }
         
     except Exception as e:
-        logger.error(f"Error processing interview step: {e}")
+        logger.error("Error processing interview step: %s", e)
         raise
+    finally:
+        # Don't leave the prefetched question generating for a failed or
+        # cancelled step
+        if next_question_task is not None and not next_question_task.done():
+            next_question_task.cancel()
+
+# Simulated answers for the one-shot workflow's theory, practical and advanced
+# questions (the intro answer is the user's own message)
+DEMO_RESPONSES = {
+    "theory": "I would use Excel's Remove Duplicates feature and also COUNTIF to identify duplicates. I'd also check for data integrity.",
+    "practical": "For profit margin, I'd use =(Sales-Cost)/Sales. For best-selling product by region, I'd use pivot tables or SUMIFS. For monthly summary, I'd use pivot tables with date grouping.",
+    "advanced": "I would use Power Query to merge CSV files, apply transformations for cleaning, and create VBA macros for dynamic reporting with user input."
+}
+
+# Longest user query passed on to the LLM (characters)
+MAX_USER_QUERY_LENGTH = 4000
+# "error" of the result returned for input rejected before any LLM call
+INVALID_INPUT_ERROR = "invalid input"
 
 async def run_excel_interview_workflow(user_query: str, user_id: str, message_id: str):
     """
@@ -409,90 +814,44 @@ async def run_excel_interview_workflow(user_query: str, user_id: str, message_id
     Returns:
         Dict containing interview evaluation and feedback
     """
+    # Reject empty or symbol-only input before spending any LLM calls on it,
+    # and cap the length to bound prompt tokens
+    user_query = (user_query or "").strip()[:MAX_USER_QUERY_LENGTH]
+    if len(user_query) < 3 or not any(char.isalnum() for char in user_query):
+        logger.info("Rejected invalid Excel interview input for user %s", user_id)
+        return {
+            "error": INVALID_INPUT_ERROR,
+            "interview_complete": False,
+            "feedback": "Please describe your Excel experience to start the interview."
+        }
+    
     try:
         # Extract candidate information
         candidate_name, experience_level = extract_candidate_info(user_query)
-        logger.info(f"Starting interactive Excel interview for {candidate_name} (Level: {experience_level})")
-        
-        # Create introduction message
-        intro_message = f"""
-        Welcome to your Excel technical interview! 
-        
-        Based on your profile, I'll be assessing your {experience_level} level Excel skills.
-        This interview will cover theoretical knowledge, practical application, and advanced features.
-        
-        Let's begin with understanding your Excel experience better.
-        """
+        logger.info("Starting interactive Excel interview for %s (Level: %s)", candidate_name, experience_level)
         
-        # Get prompts
-        intro_prompt = get_excel_interview_intro_prompt(intro_message)
-        theory_prompt = get_excel_theory_prompt()
-        practical_prompt = get_excel_practical_prompt()
-        advanced_prompt = get_excel_advanced_prompt()
-        
-        # Generate interview questions
-        intro_response = await llm.acomplete(
-            f"{intro_prompt}\n\nCandidate Level: {experience_level}\n\nGenerate a welcoming introduction and first question:"
-        )
-        
-        theory_question = await llm.acomplete(
-            f"{theory_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a theory question appropriate for this level:"
-        )
-        
-        practical_question = await llm.acomplete(
-            f"{practical_prompt}\n\nExperience Level: {experience_level}\n\nGenerate a practical scenario question:"
-        )
-        
-        advanced_question = await llm.acomplete(
-            f"{advanced_prompt}\n\nExperience Level: {experience_level}\n\nGenerate an advanced Excel question:"
+        # Generate the introduction and all questions in one round trip
+        intro_response, theory_question, practical_question, advanced_question = await generate_interview_package(
+            INTRO_PROMPT, experience_level
         )
         
         # Simulate user responses (in a real system, these would come from the user)
         # For now, we'll use the user's initial message as a response to the first question
-        user_responses = {
-            "intro": user_query,  # Use the initial message as response to intro
-            "theory": "I would use Excel's Remove Duplicates feature and also COUNTIF to identify duplicates. I'd also check for data integrity.",
-            "practical": "For profit margin, I'd use =(Sales-Cost)/Sales. For best-selling product by region, I'd use pivot tables or SUMIFS. For monthly summary, I'd use pivot tables with date grouping.",
-            "advanced": "I would use Power Query to merge CSV files, apply transformations for cleaning, and create VBA macros for dynamic reporting with user input."
-        }
-        
-        # Evaluate each response
-        intro_evaluation = await evaluate_response(
-            intro_response.text, 
-            user_responses["intro"], 
-            "Introduction", 
-            experience_level
-        )
-        
-        theory_evaluation = await evaluate_response(
-            theory_question.text, 
-            user_responses["theory"], 
-            "Theory", 
-            experience_level
-        )
-        
-        practical_evaluation = await evaluate_response(
-            practical_question.text, 
-            user_responses["practical"], 
-            "Practical", 
-            experience_level
-        )
-        
-        advanced_evaluation = await evaluate_response(
-            advanced_question.text, 
-            user_responses["advanced"], 
-            "Advanced", 
+        user_responses = {"intro": user_query, **DEMO_RESPONSES}
+        
+        # Evaluate all responses in one round trip
+        intro_evaluation, theory_evaluation, practical_evaluation, advanced_evaluation = await evaluate_responses(
+            [
+                (intro_response, user_responses["intro"], "Introduction"),
+                (theory_question, user_responses["theory"], "Theory"),
+                (practical_question, user_responses["practical"], "Practical"),
+                (advanced_question, user_responses["advanced"], "Advanced")
+            ],
             experience_level
         )
         
         # Calculate overall score
-        scores = [
-            intro_evaluation.get("score", 7),
-            theory_evaluation.get("score", 7),
-            practical_evaluation.get("score", 7),
-            advanced_evaluation.get("score", 7)
-        ]
-        overall_score = sum(scores) / len(scores)
+        overall_score = average_score((intro_evaluation, theory_evaluation, practical_evaluation, advanced_evaluation))
         
         # Compile comprehensive feedback
         feedback = f"""
@@ -501,25 +860,25 @@ async def run_excel_interview_workflow(user_query: str, user_id: str, message_id
         INTERVIEW QUESTIONS AND EVALUATIONS:
         
         1. INTRODUCTION & EXPERIENCE:
-        Question: {intro_response.text}
+        Question: {intro_response}
         Your Response: {user_responses["intro"]}
         Score: {intro_evaluation.get("score", 7)}/10
         Feedback: {intro_evaluation.get("feedback", "Good response")}
         
         2. THEORY QUESTION:
-        Question: {theory_question.text}
+        Question: {theory_question}
         Your Response: {user_responses["theory"]}
         Score: {theory_evaluation.get("score", 7)}/10
         Feedback: {theory_evaluation.get("feedback", "Good response")}
         
         3. PRACTICAL QUESTION:
-        Question: {practical_question.text}
+        Question: {practical_question}
         Your Response: {user_responses["practical"]}
         Score: {practical_evaluation.get("score", 7)}/10
         Feedback: {practical_evaluation.get("feedback", "Good response")}
         
         4. ADVANCED QUESTION:
-        Question: {advanced_question.text}
+        Question: {advanced_question}
         Your Response: {user_responses["advanced"]}
         Score: {advanced_evaluation.get("score", 7)}/10
         Feedback: {advanced_evaluation.get("feedback", "Good response")}
@@ -528,29 +887,22 @@ async def run_excel_interview_workflow(user_query: str, user_id: str, message_id
         Overall Score: {overall_score:.1f}/10
         
         Strengths:
-        - {chr(10).join(intro_evaluation.get("strengths", ["Good communication"]))}
-        - {chr(10).join(theory_evaluation.get("strengths", ["Good theoretical knowledge"]))}
-        - {chr(10).join(practical_evaluation.get("strengths", ["Good practical skills"]))}
-        - {chr(10).join(advanced_evaluation.get("strengths", ["Good advanced knowledge"]))}
+        - {NEWLINE.join(intro_evaluation.get("strengths", ["Good communication"]))}
+        - {NEWLINE.join(theory_evaluation.get("strengths", ["Good theoretical knowledge"]))}
+        - {NEWLINE.join(practical_evaluation.get("strengths", ["Good practical skills"]))}
+        - {NEWLINE.join(advanced_evaluation.get("strengths", ["Good advanced knowledge"]))}
         
         Areas for Improvement:
-        - {chr(10).join(intro_evaluation.get("improvements", ["Could provide more detail"]))}
-        - {chr(10).join(theory_evaluation.get("improvements", ["Could elaborate more"]))}
-        - {chr(10).join(practical_evaluation.get("improvements", ["Could show more examples"]))}
-        - {chr(10).join(advanced_evaluation.get("improvements", ["Could demonstrate more depth"]))}
+        - {NEWLINE.join(intro_evaluation.get("improvements", ["Could provide more detail"]))}
+        - {NEWLINE.join(theory_evaluation.get("improvements", ["Could elaborate more"]))}
+        - {NEWLINE.join(practical_evaluation.get("improvements", ["Could show more examples"]))}
+        - {NEWLINE.join(advanced_evaluation.get("improvements", ["Could demonstrate more depth"]))}
         """
         
         # Determine visual indicator based on overall score
-        if overall_score >= 8:
-            visual_indicator = "🟢 Excellent"
-        elif overall_score >= 6:
-            visual_indicator = "🟡 Good"
-        elif overall_score >= 4:
-            visual_indicator = "🟠 Satisfactory"
-        else:
-            visual_indicator = "🔴 Needs Improvement"
+        visual_indicator = get_visual_indicator(overall_score)
         
-        logger.info(f"Interactive Excel interview completed for user {user_id}")
+        logger.info("Interactive Excel interview completed for user %s", user_id)
         
         return {
             "interview_complete": True,
@@ -580,19 +932,24 @@ async def run_excel_interview_workflow(user_query: str, user_id: str, message_id
                 "experience_level": experience_level
             },
             "questions_asked": {
-                "intro": intro_response.text,
-                "theory": theory_question.text,
-                "practical": practical_question.text,
-                "advanced": advanced_question.text
+                "intro": intro_response,
+                "theory": theory_question,
+                "practical": practical_question,
+                "advanced": advanced_question
             },
-            "user_responses": user_responses
+            "user_responses": user_responses,
+            # Set when an answer could not be evaluated and got the neutral
+            # placeholder score; such results must not be cached
+            "used_fallback_evaluation": any(
+                is_fallback_evaluation(evaluation)
+                for evaluation in (intro_evaluation, theory_evaluation, practical_evaluation, advanced_evaluation)
+            )
         }
         
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
-        logger.error(f"Error in Excel interview workflow: {e}")
-        logger.error(f"Full traceback: {error_details}")
+        logger.error("Error in Excel interview workflow: %s", e)
+        logger.error("Full traceback: %s", error_details)
         return {
             "error": str(e),
             "error_details": error_details,
@@ -600,28 +957,95 @@ async def run_excel_interview_workflow(user_query: str, user_id: str, message_id
             "feedback": "An error occurred during the interview. Please try again."
         } 
 
-async def generate_final_results_from_qa_data(conversation_id: str, interview_state: Dict[str, Any]) -> Dict[str, Any]:
+async def run_many_excel_interviews(items: Iterable[Dict[str, str]],
+                                    max_concurrency: int = 10) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run Excel interview workflows for a batch of candidates concurrently and
+    yield each result as soon as it finishes (not in input order).
+    
+    Args:
+        items: Dicts with user_query, user_id and message_id for each interview
+        max_concurrency: Maximum number of workflows in flight at once
+    
+    Yields:
+        Workflow result dicts, each tagged with the user_id it belongs to
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(user_query: str, user_id: str, message_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            result = await run_excel_interview_workflow(user_query, user_id, message_id)
+        return {"user_id": user_id, **result}
+    
+    tasks = [asyncio.ensure_future(run_one(**item)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The consumer stopped early (e.g. the client disconnected)
+        for task in tasks:
+            task.cancel()
+
+# Static tail of the final results summary
+SUMMARY_RECOMMENDATIONS = """
+        RECOMMENDATIONS:
+        • Practice Excel functions regularly
+        • Work on identified weak areas
+        • Consider advanced Excel courses
+        • Apply Excel skills in real projects
+        """
+
+def format_bullets(items: List[str], empty: str) -> str:
+    """Join items into "• item" lines, or return the empty placeholder line"""
+    if not items:
+        return "• " + empty
+    return NEWLINE.join(["• " + item for item in items])
+
+# Interview state fields read by generate_final_results_from_qa_data (earlier
+# final results are reused on retries); the raw responses are not needed
+FINAL_RESULTS_PROJECTION = {
+    "interview_state.qa_pairs": 1,
+    "interview_state.evaluations": 1,
+    "interview_state.candidate_info": 1,
+    "interview_state.final_results": 1
+}
+
+async def generate_final_results_from_qa_data(conversation_id: str, interview_state: Dict[str, Any],
+                                              candidate_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Generate comprehensive final results using all stored Q&A data from the interview.
     
     Args:
         conversation_id: Conversation ID
         interview_state: Current interview state containing all Q&A data
+        candidate_info: Candidate name and experience level already read by the
+            caller; taken from interview_state when not provided
         
     Returns:
         Dict containing comprehensive final results
     """
+    # One UTC timestamp for whichever report is returned, so reports written
+    # by workers in different time zones compare correctly
+    report_date = datetime.now(timezone.utc).isoformat()
     try:
         # Get all Q&A pairs from the interview
         qa_pairs = interview_state.get("qa_pairs", [])
         evaluations = interview_state.get("evaluations", {})
-        candidate_info = interview_state.get("candidate_info", {})
+        if candidate_info is None:
+            candidate_info = interview_state.get("candidate_info", {})
+        
+        # A retried approval finds the results it already stored; reuse them
+        # unless more questions were answered since
+        existing_results = interview_state.get("final_results")
+        if qa_pairs and existing_results and existing_results.get("total_questions") == len(qa_pairs):
+            logger.info("Reusing stored final results for conversation %s", conversation_id)
+            return existing_results
         
         if not qa_pairs:
             logger.warning("No Q&A data found for final result generation")
             return {
                 "company_name": "Excel Interview - Interactive",
-                "report_date": datetime.now().isoformat(),
+                "report_date": report_date,
                 "propensity_score": {
                     "score": 7.0,
                     "rationale": "No interview data available for assessment",
@@ -631,21 +1055,13 @@ async def generate_final_results_from_qa_data(conversation_id: str, interview_st
             }
         
         # Calculate overall score from evaluations
-        scores = [eval_data.get("score", 7) for eval_data in evaluations.values()]
-        overall_score = sum(scores) / len(scores) if scores else 7
+        overall_score = average_score(evaluations.values())
         
         # Determine visual indicator based on overall score
-        if overall_score >= 8:
-            visual_indicator = "🟢 Excellent"
-        elif overall_score >= 6:
-            visual_indicator = "🟡 Good"
-        elif overall_score >= 4:
-            visual_indicator = "🟠 Satisfactory"
-        else:
-            visual_indicator = "🔴 Needs Improvement"
+        visual_indicator = get_visual_indicator(overall_score)
         
-        # Create detailed summary using all Q&A data
-        detailed_summary = f"""
+        # Create detailed summary using all Q&A data (parts joined once at the end)
+        summary_parts = [f"""
         INTERVIEW COMPLETE - COMPREHENSIVE ANALYSIS
         
         Candidate: {candidate_info.get('name', 'Unknown')}
@@ -654,7 +1070,7 @@ async def generate_final_results_from_qa_data(conversation_id: str, interview_st
         Total Questions Answered: {len(qa_pairs)}
         
         DETAILED BREAKDOWN:
-        """
+        """]
         
         # Add each Q&A pair to the summary
         for i, qa in enumerate(qa_pairs, 1):
@@ -665,13 +1081,13 @@ async def generate_final_results_from_qa_data(conversation_id: str, interview_st
             score = evaluation.get("score", 7)
             feedback = evaluation.get("feedback", "No feedback available")
             
-            detailed_summary += f"""
+            summary_parts.append(f"""
         Question {i} ({step.title()}):
-        Q: {question[:200]}{'...' if len(question) > 200 else ''}
-        A: {answer[:200]}{'...' if len(answer) > 200 else ''}
+        Q: {truncate_tokens(question, 50)}
+        A: {truncate_tokens(answer, 50)}
         Score: {score}/10
         Feedback: {feedback}
-        """
+        """)
         
         # Add strengths and areas for improvement
         strengths = []
@@ -684,45 +1100,41 @@ async def generate_final_results_from_qa_data(conversation_id: str, interview_st
             else:
                 improvements.append(f"Needs improvement in {step} area")
         
-        detailed_summary += f"""
-        
-        STRENGTHS:
-        {chr(10).join(f"• {strength}" for strength in strengths) if strengths else "• No specific strengths identified"}
-        
-        AREAS FOR IMPROVEMENT:
-        {chr(10).join(f"• {improvement}" for improvement in improvements) if improvements else "• Overall good performance"}
-        
-        RECOMMENDATIONS:
-        • Practice Excel functions regularly
-        • Work on identified weak areas
-        • Consider advanced Excel courses
-        • Apply Excel skills in real projects
-        """
+        summary_parts.extend([
+            "\n        \n        STRENGTHS:\n        ",
+            format_bullets(strengths, "No specific strengths identified"),
+            "\n        \n        AREAS FOR IMPROVEMENT:\n        ",
+            format_bullets(improvements, "Overall good performance"),
+            "\n        ",
+            SUMMARY_RECOMMENDATIONS
+        ])
+        detailed_summary = "".join(summary_parts)
         
         # Create final results structure
         final_results = {
             "company_name": "Excel Interview - Interactive",
-            "report_date": datetime.now().isoformat(),
+            "report_date": report_date,
             "propensity_score": {
                 "score": overall_score,
                 "rationale": f"Based on comprehensive analysis of {len(qa_pairs)} interview questions covering theoretical knowledge, practical application, and advanced Excel features",
                 "visual_indicator": visual_indicator
             },
             "overall_summary": detailed_summary,
-            "qa_data": qa_pairs,  # Include all Q&A data for detailed analysis
-            "evaluations": evaluations,  # Include all evaluations
-            "candidate_info": candidate_info
+            # The Q&A pairs and evaluations are not copied in: they already sit
+            # beside final_results in interview_state (see get_interview_qa_data)
+            "candidate_info": candidate_info,
+            "total_questions": len(qa_pairs)
         }
         
-        logger.info(f"Generated comprehensive final results for conversation {conversation_id}")
+        logger.info("Generated comprehensive final results for conversation %s", conversation_id)
         return final_results
         
     except Exception as e:
-        logger.error(f"Error generating final results: {e}")
+        logger.error("Error generating final results: %s", e)
         # Return fallback results
         return {
             "company_name": "Excel Interview - Interactive",
-            "report_date": datetime.now().isoformat(),
+            "report_date": report_date,
             "propensity_score": {
                 "score": 7.0,
                 "rationale": "Error occurred during result generation",
@@ -742,10 +1154,11 @@ async def get_interview_qa_data(conversation_id: str) -> Dict[str, Any]:
         Dict containing all Q&A data and interview state
     """
     try:
-        from app.helpers.mongodb import mongodb
-        from bson import ObjectId
         collection = mongodb.get_collection("conversations")
-        conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+        conversation = await collection.find_one(
+            {"_id": ObjectId(conversation_id)},
+            {**FINAL_RESULTS_PROJECTION, "interview_state.is_complete": 1}
+        )
         
         if not conversation:
             raise ValueError(f"Conversation with ID {conversation_id} not found")
@@ -765,9 +1178,66 @@ async def get_interview_qa_data(conversation_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error retrieving Q&A data: {e}")
+        logger.error("Error retrieving Q&A data: %s", e)
         raise 
 
+def build_review_summary(candidate_info: Dict[str, Any], interview_state: Dict[str, Any]) -> str:
+    """
+    Build the summary of a completed interview shown to the human reviewer.
+    
+    Args:
+        candidate_info: Candidate name and experience level
+        interview_state: Interview state containing all Q&A data
+        
+    Returns:
+        Review summary text ending with the approval question
+    """
+    # Get all Q&A data for human review
+    qa_pairs = interview_state.get("qa_pairs", [])
+    evaluations = interview_state.get("evaluations", {})
+    
+    # Prepare summary for human review (parts joined once at the end)
+    review_parts = [f"""
+            INTERVIEW COMPLETE - HUMAN REVIEW REQUIRED
+            
+            Candidate: {candidate_info.get('name', 'Unknown')}
+            Experience Level: {candidate_info.get('experience_level', 'Unknown')}
+            Total Questions Answered: {len(qa_pairs)}
+            
+            INTERVIEW SUMMARY:
+            """]
+    
+    # Add each Q&A pair to the review summary
+    for i, qa in enumerate(qa_pairs, 1):
+        step = qa.get("step", "unknown")
+        question = qa.get("question", "")
+        answer = qa.get("answer", "")
+        qa_evaluation = evaluations.get(step, {})
+        score = qa_evaluation.get("score", 7)
+        feedback = qa_evaluation.get("feedback", "No feedback available")
+        
+        review_parts.append(f"""
+            Question {i} ({step.title()}):
+            Q: {truncate_tokens(question, 40)}
+            A: {truncate_tokens(answer, 40)}
+            Score: {score}/10
+            Feedback: {feedback}
+            """)
+    
+    # Calculate preliminary overall score
+    preliminary_score = average_score(evaluations.values())
+    
+    review_parts.append(f"""
+            
+            PRELIMINARY OVERALL SCORE: {preliminary_score:.1f}/10
+            
+            Do you approve this interview evaluation and want to generate final results? (yes/no):
+            """)
+    return "".join(review_parts)
+
+# How long a workflow waits for the human reviewer before giving up
+HUMAN_APPROVAL_TIMEOUT = float(os.getenv("HUMAN_APPROVAL_TIMEOUT_SECONDS", "600"))
+
 async def get_human_approval_for_interview(review_summary: str, conversation_id: str) -> bool:
     """
     Get human approval for interview evaluation using LlamaIndex workflow events.
@@ -784,19 +1254,12 @@ async def get_human_approval_for_interview(review_summary: str, conversation_id:
         # For now, we'll simulate the process
         
         # Log the review summary for human review
-        logger.info(f"Human review required for conversation {conversation_id}")
-        logger.info(f"Review summary: {review_summary}")
-        
-        # Simulate human approval process
-        # In production, this would trigger a workflow event that waits for human input
-        question = f"""
-        {review_summary}
-        
-        Do you approve this interview evaluation and want to generate final results? (yes/no): 
-        """
+        logger.info("Human review required for conversation %s", conversation_id)
+        logger.debug("Review summary: %s", review_summary)
         
         # For now, we'll simulate automatic approval
-        # In a real implementation, this would use:
+        # In a real implementation, this would trigger a workflow event that
+        # waits for human input (see workflow_human_approval_step):
         # response_event = await ctx.wait_for_event(
         #     HumanResponseEvent,
         #     waiter_event=InputRequiredEvent(prefix=question)
@@ -806,12 +1269,12 @@ async def get_human_approval_for_interview(review_summary: str, conversation_id:
         # Simulate human approval (you can modify this for testing)
         simulated_human_response = "yes"  # Change to "no" to test rejection
         
-        logger.info(f"Simulated human response: {simulated_human_response}")
+        logger.debug("Simulated human response: %s", simulated_human_response)
         
         return simulated_human_response.strip().lower() == "yes"
         
     except Exception as e:
-        logger.error(f"Error in human approval process: {e}")
+        logger.error("Error in human approval process: %s", e)
         # Default to approval if there's an error
         return True 
 
@@ -828,6 +1291,10 @@ async def workflow_human_approval_step(ctx, review_summary: str, conversation_id
         Dict containing approval status and final results
     """
     try:
+        # Parse the id once, before waiting on the reviewer
+        oid = ObjectId(conversation_id)
+        collection = mongodb.get_collection("conversations")
+        
         # Present the review summary to the human
         question = f"""
         {review_summary}
@@ -835,33 +1302,35 @@ async def workflow_human_approval_step(ctx, review_summary: str, conversation_id
         Do you approve this interview evaluation and want to generate final results? (yes/no): 
         """
         
-        # Wait for human response using LlamaIndex workflow events
-        response_event = await ctx.wait_for_event(
-            HumanResponseEvent,
-            waiter_event=InputRequiredEvent(prefix=question)
+        # Wait for human response using LlamaIndex workflow events; the wait
+        # is bounded so an abandoned review does not hold the session forever
+        from llama_index.core.workflow import InputRequiredEvent, HumanResponseEvent
+        response_event = await asyncio.wait_for(
+            ctx.wait_for_event(
+                HumanResponseEvent,
+                waiter_event=InputRequiredEvent(prefix=question)
+            ),
+            timeout=HUMAN_APPROVAL_TIMEOUT
         )
         
         human_response = response_event.response.strip().lower()
         approved = human_response == "yes"
         
         if approved:
-            # Get the interview state and generate final results
-            from app.helpers.mongodb import mongodb
-            from bson import ObjectId
-            collection = mongodb.get_collection("conversations")
-            conversation = collection.find_one({"_id": ObjectId(conversation_id)})
+            # Get the parts of the interview state the final results are built from
+            conversation = await collection.find_one({"_id": oid}, FINAL_RESULTS_PROJECTION)
             
             if conversation:
                 interview_state = conversation.get("interview_state", {})
                 final_results = await generate_final_results_from_qa_data(conversation_id, interview_state)
                 
                 # Update the interview state with approval
-                interview_state["human_approved"] = True
-                interview_state["final_results"] = final_results
-                
-                collection.update_one(
-                    {"_id": ObjectId(conversation_id)},
-                    {"$set": {"interview_state": interview_state}}
+                await collection.update_one(
+                    {"_id": oid},
+                    {"$set": {
+                        "interview_state.human_approved": True,
+                        "interview_state.final_results": final_results
+                    }}
                 )
                 
                 return {
@@ -876,14 +1345,9 @@ async def workflow_human_approval_step(ctx, review_summary: str, conversation_id
                     "message": "Could not find interview data for final results generation."
                 }
         else:
-            # Human rejected the evaluation
-            from app.helpers.mongodb import mongodb
-            from bson import ObjectId
-            collection = mongodb.get_collection("conversations")
-            
-            # Update the interview state with rejection
-            collection.update_one(
-                {"_id": ObjectId(conversation_id)},
+            # Human rejected the evaluation: update the interview state with rejection
+            await collection.update_one(
+                {"_id": oid},
                 {"$set": {
                     "interview_state.human_rejected": True,
                     "interview_state.rejection_reason": "Human reviewer did not approve the evaluation"
@@ -896,7 +1360,7 @@ async def workflow_human_approval_step(ctx, review_summary: str, conversation_id
             }
             
     except Exception as e:
-        logger.error(f"Error in workflow human approval step: {e}")
+        logger.error("Error in workflow human approval step: %s", e)
         return {
             "approved": False,
             "error": str(e),
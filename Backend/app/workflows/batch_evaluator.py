@@ -0,0 +1,126 @@
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, TypedDict
+import orjson
+from openai import AsyncOpenAI
+from app.workflows.Excel_Interview_workflow import (
+    EVALUATION_RESPONSE_FORMAT,
+    RESPONSE_EVALUATION_PROMPT,
+    format_response_details,
+    llm_http_client
+)
+
+logger = logging.getLogger(__name__)
+
+# Batch jobs are billed at half the real-time price but may take up to 24h,
+# so they are only for offline work such as re-evaluating stored transcripts.
+# Live interviews keep using evaluate_response().
+BATCH_MODEL = "gpt-4o-mini"
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class EvaluationItem(TypedDict):
+    """One answer to evaluate; custom_id must be unique within the batch"""
+    custom_id: str
+    question: str
+    user_response: str
+    question_type: str
+    experience_level: str
+
+
+_client: Optional[AsyncOpenAI] = None
+
+def get_openai_client() -> AsyncOpenAI:
+    """OpenAI client for the Files/Batches API, sharing the LLM connection pool"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=llm_http_client)
+    return _client
+
+
+def build_batch_file(items: List[EvaluationItem]) -> bytes:
+    """Serialize evaluation requests as Batch API JSONL, one request per line"""
+    lines = []
+    for item in items:
+        lines.append(orjson.dumps({
+            "custom_id": item["custom_id"],
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": BATCH_MODEL,
+                "response_format": EVALUATION_RESPONSE_FORMAT,
+                "messages": [
+                    {"role": "system", "content": RESPONSE_EVALUATION_PROMPT},
+                    {"role": "user", "content": format_response_details(
+                        item["question"],
+                        item["user_response"],
+                        item["question_type"],
+                        item["experience_level"]
+                    )}
+                ]
+            }
+        }))
+    return b"\n".join(lines)
+
+
+async def submit_evaluation_batch(items: List[EvaluationItem]) -> str:
+    """
+    Upload evaluation requests and start a batch job.
+    
+    Returns:
+        The batch ID to pass to wait_for_evaluation_batch
+    """
+    client = get_openai_client()
+    batch_file = await client.files.create(
+        file=("evaluations.jsonl", build_batch_file(items)),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+    logger.info("Submitted evaluation batch %s with %d requests", batch.id, len(items))
+    return batch.id
+
+
+async def wait_for_evaluation_batch(batch_id: str, poll_interval: float = 60) -> Dict[str, Dict[str, Any]]:
+    """
+    Poll a batch job until it finishes and collect its evaluations.
+    
+    Returns:
+        Dict mapping custom_id to the parsed evaluation; requests that failed
+        or returned invalid JSON are left out
+    """
+    client = get_openai_client()
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in BATCH_FINAL_STATUSES:
+            break
+        logger.debug("Evaluation batch %s is %s", batch_id, batch.status)
+        await asyncio.sleep(poll_interval)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error("Evaluation batch %s ended with status %s", batch_id, batch.status)
+        return {}
+    
+    output = await client.files.content(batch.output_file_id)
+    evaluations = {}
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        result = orjson.loads(line)
+        try:
+            content = result["response"]["body"]["choices"][0]["message"]["content"]
+            evaluations[result["custom_id"]] = orjson.loads(content)
+        except (KeyError, IndexError, TypeError, orjson.JSONDecodeError) as e:
+            logger.warning("Skipping batch result %s: %s", result.get("custom_id"), e)
+    return evaluations
+
+
+async def evaluate_responses_batch(items: List[EvaluationItem], poll_interval: float = 60) -> Dict[str, Dict[str, Any]]:
+    """Evaluate many stored answers through the Batch API (offline use only)"""
+    batch_id = await submit_evaluation_batch(items)
+    return await wait_for_evaluation_batch(batch_id, poll_interval)
\ No newline at end of file
@@ -1,5 +1,15 @@
+import os
 import uvicorn
-from app import app
+
+MAX_DEFAULT_WORKERS = 4
 
 if __name__ == '__main__':
-    uvicorn.run(app, host='0.0.0.0', port=8000)
\ No newline at end of file
+    # Defaults to (2 * cores) + 1 workers, capped at MAX_DEFAULT_WORKERS: each
+    # worker keeps its own MongoDB pool (MONGODB_MIN_POOL_SIZE connections
+    # open even when idle), which must fit shared-tier connection limits.
+    # Override with WEB_CONCURRENCY
+    workers = int(os.getenv("WEB_CONCURRENCY", min(2 * (os.cpu_count() or 1) + 1, MAX_DEFAULT_WORKERS)))
+    # Workers inherit this and split per-process budgets (LLM rate limits) by it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    # loop/http "auto" pick uvloop and httptools when installed
+    uvicorn.run('app:app', host='0.0.0.0', port=8000, workers=workers, loop='auto', http='auto')
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Pre-generate interview questions into the question_pool collection so the
+interview flow can serve questions without an LLM call.
+
+Run from the Backend directory, e.g. periodically from cron to refresh the pool:
+    python -m scripts.prepopulate_questions --per-key 200
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from app.helpers.mongodb import mongodb
+from app.workflows.Excel_Interview_workflow import (
+    EXPERIENCE_LEVELS,
+    QUESTION_POOL_COLLECTION,
+    QUESTION_STEPS,
+    generate_text,
+    llm_http_client,
+    question_generation_prompt
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def generate_pool_entries(step: str, level: str, count: int) -> list:
+    """Generate count questions for one (step, level) pair"""
+    system_prompt, user_content = question_generation_prompt(step, level)
+    # Concurrency is bounded by the workflow's LLM semaphore
+    texts = await asyncio.gather(*(generate_text(system_prompt, user_content) for _ in range(count)))
+    created_at = datetime.now(timezone.utc)
+    return [
+        {"step": step, "level": level, "text": text.strip(), "used_count": 0, "created_at": created_at}
+        for text in texts if text.strip()
+    ]
+
+
+async def prepopulate(per_key: int, replace: bool):
+    pool = mongodb.get_collection(QUESTION_POOL_COLLECTION)
+    await mongodb.ensure_indexes()
+    try:
+        for step in QUESTION_STEPS:
+            for level in EXPERIENCE_LEVELS:
+                entries = await generate_pool_entries(step, level, per_key)
+                if replace:
+                    await pool.delete_many({"step": step, "level": level})
+                if entries:
+                    await pool.insert_many(entries, ordered=False)
+                logger.info("Stored %d questions for %s/%s", len(entries), step, level)
+    finally:
+        await llm_http_client.aclose()
+        mongodb.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-key", type=int, default=200, help="questions per (step, experience level)")
+    parser.add_argument("--replace", action="store_true", help="drop existing questions for each key first")
+    args = parser.parse_args()
+    asyncio.run(prepopulate(args.per_key, args.replace))
\ No newline at end of file
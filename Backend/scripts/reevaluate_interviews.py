@@ -0,0 +1,104 @@
+"""
+Re-evaluate the stored answers of completed interviews through the OpenAI
+Batch API (half the real-time price) and write the new evaluations back to
+interview_state.evaluations. Stored final_results are left as they are.
+
+A batch may take up to 24h to finish, so this is for offline reprocessing
+only, e.g. after the evaluation prompt changed. Run from the Backend directory:
+    python -m scripts.reevaluate_interviews --limit 500
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from app.helpers.mongodb import mongodb
+from app.workflows.Excel_Interview_workflow import llm_http_client, response_evaluation_adapter
+from app.workflows.batch_evaluator import EvaluationItem, evaluate_responses_batch
+
+logger = logging.getLogger(__name__)
+
+REEVALUATION_PROJECTION = {
+    "interview_state.qa_pairs": 1,
+    "interview_state.candidate_info.experience_level": 1
+}
+
+
+async def collect_items(limit: int, conversation_ids: Optional[List[str]]) -> Tuple[List[EvaluationItem], Dict[str, Tuple[ObjectId, str]]]:
+    """
+    Build one evaluation request per stored Q&A pair.
+
+    Returns:
+        The requests, and a mapping of each custom_id to its (conversation _id, step)
+    """
+    query = {"interview_state.is_complete": True, "interview_state.qa_pairs.0": {"$exists": True}}
+    if conversation_ids:
+        query["_id"] = {"$in": [ObjectId(conversation_id) for conversation_id in conversation_ids]}
+
+    items: List[EvaluationItem] = []
+    targets: Dict[str, Tuple[ObjectId, str]] = {}
+    cursor = mongodb.get_collection("conversations").find(query, REEVALUATION_PROJECTION).limit(limit)
+    async for conversation in cursor:
+        interview_state = conversation.get("interview_state", {})
+        experience_level = interview_state.get("candidate_info", {}).get("experience_level", "intermediate")
+        for index, qa_pair in enumerate(interview_state.get("qa_pairs", [])):
+            custom_id = f"{conversation['_id']}:{index}"
+            items.append({
+                "custom_id": custom_id,
+                "question": qa_pair.get("question", ""),
+                "user_response": qa_pair.get("answer", ""),
+                # Same question type the live interview passes for this step
+                "question_type": qa_pair["step"].title(),
+                "experience_level": experience_level
+            })
+            targets[custom_id] = (conversation["_id"], qa_pair["step"])
+    return items, targets
+
+
+async def reevaluate(limit: int, conversation_ids: Optional[List[str]], poll_interval: float):
+    try:
+        items, targets = await collect_items(limit, conversation_ids)
+        if not items:
+            logger.info("No completed interviews to re-evaluate")
+            return
+        evaluations = await evaluate_responses_batch(items, poll_interval)
+
+        # Like the live interview, a step answered more than once keeps the
+        # evaluation of its last answer (items are in qa_pairs order)
+        updates: Dict[ObjectId, Dict[str, dict]] = {}
+        for item in items:
+            evaluation = evaluations.get(item["custom_id"])
+            if evaluation is None:
+                continue
+            try:
+                evaluation = response_evaluation_adapter.validate_python(evaluation)
+            except ValidationError as e:
+                logger.warning("Skipping invalid evaluation %s: %s", item["custom_id"], e)
+                continue
+            oid, step = targets[item["custom_id"]]
+            updates.setdefault(oid, {})[f"interview_state.evaluations.{step}"] = evaluation
+
+        if updates:
+            reevaluated_at = datetime.now(timezone.utc)
+            await mongodb.get_collection("conversations").bulk_write([
+                UpdateOne({"_id": oid}, {"$set": {**fields, "reevaluated_at": reevaluated_at}})
+                for oid, fields in updates.items()
+            ], ordered=False)
+        logger.info("Stored %d step evaluations for %d conversations (%d answers submitted)",
+                    sum(len(fields) for fields in updates.values()), len(updates), len(items))
+    finally:
+        await llm_http_client.aclose()
+        mongodb.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=500, help="maximum number of conversations to re-evaluate")
+    parser.add_argument("--conversation-id", action="append", dest="conversation_ids",
+                        help="only re-evaluate this conversation (repeatable)")
+    parser.add_argument("--poll-interval", type=float, default=60, help="seconds between batch status checks")
+    args = parser.parse_args()
+    asyncio.run(reevaluate(args.limit, args.conversation_ids, args.poll_interval))
@@ -24,6 +24,8 @@ export default function HistoryPage() {
   const [conversations, setConversations] = useState<Conversation[]>([])
   const [filteredConversations, setFilteredConversations] = useState<Conversation[]>([])
   const [isLoading, setIsLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [searchTerm, setSearchTerm] = useState("")
   const [statusFilter, setStatusFilter] = useState("all")
   const [dateFilter, setDateFilter] = useState("all")
@@ -37,11 +39,15 @@ export default function HistoryPage() {
     filterConversations()
   }, [conversations, searchTerm, statusFilter, dateFilter])
 
-  const loadConversations = async () => {
+  const loadConversations = async (after: string | null = null) => {
+    if (after) {
+      setIsLoadingMore(true)
+    }
     try {
-      const response = await conversationService.getConversations()
+      const response = await conversationService.getConversations(after)
       if (response.status_code === 200) {
-        setConversations(response.data)
+        setConversations((previous) => (after ? [...previous, ...response.data] : response.data))
+        setNextCursor(response.next_cursor ?? null)
       }
     } catch (error) {
       console.error("Error loading conversations:", error)
@@ -52,6 +58,7 @@ export default function HistoryPage() {
       })
     } finally {
       setIsLoading(false)
+      setIsLoadingMore(false)
     }
   }
 
@@ -201,7 +208,8 @@ export default function HistoryPage() {
         {/* Results Count */}
         <div className="mb-4">
           <p className="text-sm text-gray-600 dark:text-gray-300">
-            Showing {filteredConversations.length} of {conversations.length} interviews
+            Showing {filteredConversations.length} of {conversations.length}
+            {nextCursor ? "+" : ""} interviews
           </p>
         </div>
 
@@ -258,6 +266,15 @@ export default function HistoryPage() {
             ))}
           </div>
         )}
+
+        {/* Next page of the history, loaded on request */}
+        {nextCursor && (
+          <div className="mt-6 text-center">
+            <Button variant="outline" onClick={() => loadConversations(nextCursor)} disabled={isLoadingMore}>
+              {isLoadingMore ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   )
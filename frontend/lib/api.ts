@@ -87,8 +87,11 @@ export const conversationService = {
     return response
   },
 
-  async getConversations() {
-    const response = await api.get("/get_conversations")
+  async getConversations(after?: string | null) {
+    // The endpoint is paginated: pass the previous page's next_cursor to get
+    // the page after it (next_cursor is null on the last page)
+    const query = after ? `?after=${encodeURIComponent(after)}` : ""
+    const response = await api.get(`/get_conversations${query}`)
     return response
   },
 